@@ -3,7 +3,8 @@ import { ResponsiveBar } from "@nivo/bar";
 import { tokens } from "../theme";
 import { useState, useEffect } from "react";
 
-export default function BarChart({ isDashboard = false }) {
+// `data` is passed by the dashboard (null while it loads); fetched here when undefined
+export default function BarChart({ isDashboard = false, data }) {
   const theme = useTheme();
   const colors = tokens(theme.palette.mode);
 
@@ -14,19 +15,21 @@ export default function BarChart({ isDashboard = false }) {
   const [years, setYears] = useState([]);
 
   useEffect(() => {
+    const showData = (data) => {
+      setChartData(data);
+
+      const uniqueYears = [
+        ...new Set(data.map((item) => item.year_month.split("-")[0])),
+      ];
+      setYears(uniqueYears);
+    };
+
     const fetchData = async () => {
       try {
         const response = await fetch(
           "http://localhost:5000/api/bar_chart_data"
         );
-        const data = await response.json();
-
-        setChartData(data);
-
-        const uniqueYears = [
-          ...new Set(data.map((item) => item.year_month.split("-")[0])),
-        ];
-        setYears(uniqueYears);
+        showData(await response.json());
       } catch (error) {
         console.error("Error fetching chart data:", error);
       } finally {
@@ -34,8 +37,15 @@ export default function BarChart({ isDashboard = false }) {
       }
     };
 
+    if (data !== undefined) {
+      if (data !== null) {
+        showData(data);
+        setLoading(false);
+      }
+      return;
+    }
     fetchData();
-  }, []);
+  }, [data]);
 
   // Abbreviate month names in the data
   const monthNames = [
@@ -6,7 +6,8 @@ import axios from "axios";
 import { useState, useEffect } from "react";
 import { Box, CircularProgress } from "@mui/material";
 
-export default function GeographyChart({ isDashboard = false }) {
+// `data` is passed by the dashboard (null while it loads); fetched here when undefined
+export default function GeographyChart({ isDashboard = false, data }) {
   const theme = useTheme();
   const colors = tokens(theme.palette.mode);
 
@@ -29,8 +30,15 @@ export default function GeographyChart({ isDashboard = false }) {
       }
     };
 
+    if (data !== undefined) {
+      if (data !== null) {
+        setGeoChartData(data);
+        setLoading(false);
+      }
+      return;
+    }
     fetchGeoChartData();
-  }, []); // Empty dependency array to fetch data only once on mount
+  }, [data]); // Fetch only once on mount, unless the data is passed in
 
   // If loading, show CircularProgress
   if (loading) {
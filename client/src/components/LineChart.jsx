@@ -8,6 +8,7 @@ import CircularProgress from "@mui/material/CircularProgress";
 export default function LineChart({
   isCustomLineColors = true,
   isDashboard = false,
+  data, // Passed by the dashboard (null while it loads); fetched here when undefined
 }) {
   const theme = useTheme();
   const colors = tokens(theme.palette.mode);
@@ -16,23 +17,27 @@ export default function LineChart({
   const [years, setYears] = useState([]);
   const [isLoading, setIsLoading] = useState(true);
 
-  // Fetch data from the API
+  // Fetch data from the API, unless it was passed in
   useEffect(() => {
+    const showData = (data) => {
+      setYears([
+        ...new Set(data.map((item) => item.id)), // Extract years from the 'id'
+      ]);
+      setLineChartData(data); // Directly set the data returned from the backend
+      setIsLoading(false);
+    };
+    if (data !== undefined) {
+      if (data !== null) showData(data);
+      return;
+    }
     axios
       .get("http://127.0.0.1:5000/api/line_chart_data")
-      .then((response) => {
-        const data = response.data;
-        setYears([
-          ...new Set(data.map((item) => item.id)), // Extract years from the 'id'
-        ]);
-        setLineChartData(data); // Directly set the data returned from the backend
-        setIsLoading(false);
-      })
+      .then((response) => showData(response.data))
       .catch((error) => {
         console.error("Error fetching line chart data:", error);
         setIsLoading(false);
       });
-  }, []);
+  }, [data]);
 
   return (
     <>
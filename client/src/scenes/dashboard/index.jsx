@@ -20,44 +20,38 @@ import Card from "../../components/Card";
 import ProgressCircle from "../../components/ProgressCircle";
 import LocalShippingIcon from "@mui/icons-material/LocalShipping";
 
+// GET a URL, retrying while the server answers 503 (its data is still loading)
+const getWhenReady = (url, retries = 30) =>
+  axios.get(url).catch((error) => {
+    if (error.response?.status !== 503 || retries <= 0) throw error;
+    const delay = Number(error.response.headers["retry-after"] || 1) * 1000;
+    return new Promise((resolve) => setTimeout(resolve, delay)).then(() =>
+      getWhenReady(url, retries - 1)
+    );
+  });
+
 export default function Dashboard() {
   const theme = useTheme();
   const colors = tokens(theme.palette.mode);
 
-  // State to store sales data and loading state
-  const [salesData, setSalesData] = useState([]);
-  const [cardsData, setCardsData] = useState(null);
-  const [loading, setLoading] = useState(true);
-  const [cardsLoading, setCardsLoading] = useState(true);
+  // Widgets of the dashboard, all from one snapshot; null while loading, empty if that failed
+  const [widgets, setWidgets] = useState(null);
 
-  // Fetch sales_data API
+  // Fetch every widget in one request; the sales widget holds only the latest transactions
   useEffect(() => {
-    axios
-      .get("http://127.0.0.1:5000/api/sales_data")
-      .then((response) => {
-        // Get the last 10 transactions
-        setSalesData(response.data.slice(-50).reverse());
-        setLoading(false);
-      })
+    getWhenReady(
+      "http://127.0.0.1:5000/api/dashboard?widgets=cards,sales,line,bar,geo"
+    )
+      .then((response) => setWidgets(response.data.widgets))
       .catch((error) => {
-        console.error("Error fetching sales data", error);
-        setLoading(false);
+        console.error("Error fetching dashboard data", error);
+        setWidgets({}); // The charts then fetch their own data
       });
   }, []);
 
-  // Fetch cards_data API
-  useEffect(() => {
-    axios
-      .get("http://127.0.0.1:5000/api/cards_data")
-      .then((response) => {
-        setCardsData(response.data);
-        setCardsLoading(false);
-      })
-      .catch((error) => {
-        console.error("Error fetching cards data", error);
-        setCardsLoading(false);
-      });
-  }, []);
+  const cardsData = widgets?.cards;
+  const salesData = widgets?.sales || [];
+  const loading = widgets === null;
 
   return (
     <Box m='20px'>
@@ -96,7 +90,7 @@ export default function Dashboard() {
           justifyContent='center'
         >
           <Card
-            title={cardsData?.november_orders || "loading..."}
+            title={cardsData?.orders || "loading..."}
             subtitle='Orders this month'
             progress={cardsData?.percentage_diff_orders || "loading..."}
             increase={`${
@@ -119,7 +113,7 @@ export default function Dashboard() {
           justifyContent='center'
         >
           <Card
-            title={`${cardsData?.november_income || "loading..."}€`}
+            title={`${cardsData?.income || "loading..."}€`}
             subtitle='Income value'
             progress={cardsData?.percentage_diff_income || "loading..."}
             increase={`${
@@ -142,7 +136,7 @@ export default function Dashboard() {
           justifyContent='center'
         >
           <Card
-            title={cardsData?.november_new_clients || "loading..."}
+            title={cardsData?.new_clients || "loading..."}
             subtitle='New Clients'
             progress={cardsData?.percentage_diff_new_clients || "loading..."}
             increase={`${
@@ -165,7 +159,7 @@ export default function Dashboard() {
           justifyContent='center'
         >
           <Card
-            title={cardsData?.november_inbound_traffic || "loading..."}
+            title={cardsData?.inbound_traffic || "loading..."}
             subtitle='Traffic Inbound'
             progress={
               cardsData?.percentage_diff_inbound_traffic || "loading..."
@@ -207,7 +201,7 @@ export default function Dashboard() {
           </Box>
           {/* LINE CHART */}
           <Box height='250px' mt='-20px' ml='40px'>
-            <LineChart isDashboard={true} />
+            <LineChart isDashboard={true} data={widgets && widgets.line} />
           </Box>
         </Box>
         {/* TRANSACTIONS */}
@@ -307,14 +301,14 @@ export default function Dashboard() {
               color={colors.greenAccent[500]}
               sx={{ mt: "15px" }}
             >
-              {`${cardsData?.annual_income_2024 || "loading..."}€  ${
+              {`${cardsData?.annual_income || "loading..."}€  ${
                 cardsData?.percentage_diff_income_year > 0
                   ? `+${cardsData?.percentage_diff_income_year * 100}`
                   : cardsData?.percentage_diff_income_year * 100
               } %`}
             </Typography>
             <Typography variant='h5' fontWeight='600' mt='5px'>
-              Total Revenue in 2024
+              Total Revenue in {cardsData?.period?.slice(0, 4) || "..."}
             </Typography>
           </Box>
         </Box>
@@ -333,7 +327,7 @@ export default function Dashboard() {
             Traffic by Month
           </Typography>
           <Box height='250px' mt='-27px'>
-            <BarChart isDashboard={true} />
+            <BarChart isDashboard={true} data={widgets && widgets.bar} />
           </Box>
         </Box>
 
@@ -348,7 +342,7 @@ export default function Dashboard() {
             Sales by Country
           </Typography>
           <Box height='200px'>
-            <GeographyChart isDashboard={true} />
+            <GeographyChart isDashboard={true} data={widgets && widgets.geo} />
           </Box>
         </Box>
       </Box>
@@ -1,58 +1,329 @@
-from flask import Flask, jsonify, request
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, jsonify, redirect, request
 from flask_cors import CORS
-import pandas as pd
-from threading import Timer
-from utils.data_processing import sales_df, bar_chart_data, line_chart_data, pie_chart_data, geo_chart_data, cards_data, convert_int64_to_int
+from utils.sources import DATA_DIR, CLIENTS_FILE, SALES_SOURCES
+from utils.team_store import TeamStore
+from utils.response_cache import ResponseCache
+from utils.payloads import Payload, StreamedPayload, gzip_chunks, join_payloads, payload_response
+from utils.snapshot import SnapshotRef
+from utils.live_updates import UpdateFeed
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, MetricsText, RequestMetrics, RequestProfiler
+from utils.scheduler import RefreshScheduler, RefreshStats, run_parallel
+from utils.warm_snapshot import SNAPSHOT_DIR, load_snapshot, save_snapshot
+
+# The data layer (pandas, numpy and the modules built on them) is imported by
+# create_app() rather than here, so tools and tests can import this module cheaply.
+# Routes import the parts they use only once the tables they slice are loaded.
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all domains
-
-# Cache to store the data
-cache = {
-    "sales_data": [],
-    "team_data": [],
-    "client_data": [],
-    "bar_chart_data": [],
-    "line_chart_data": [],
-    "pie_chart_data": [],
-    "geo_chart_data": [],
-    "cards_data": []  # Include cards_data here
-}
+CORS(app, expose_headers=["ETag", "X-Data-Version", "Retry-After"])  # Enable CORS for all domains
+
+# Directory of the CSV sources (and of their columnar copies and the team database)
+app.config["DATA_DIR"] = os.environ.get("DATA_DIR", DATA_DIR)
+
+# Payloads saved after each refresh, served by the next start until its first refresh is live
+app.config["SNAPSHOT_DIR"] = os.environ.get("SNAPSHOT_DIR", os.path.join(app.config["DATA_DIR"], SNAPSHOT_DIR))
+
+# Public URL of the event stream when a separate stream server serves it (see gunicorn.conf.py)
+app.config["STREAM_URL"] = os.environ.get("STREAM_URL")
+
+# Seconds between background refreshes
+app.config["REFRESH_INTERVAL"] = float(os.environ.get("REFRESH_INTERVAL", 60))
+
+# Answer requests carrying ?__profile=1 with a cProfile report (never enable in production)
+app.config["PROFILING"] = os.environ.get("PROFILING", "").lower() in ("1", "true", "yes")
+if app.config["PROFILING"]:
+    app.wsgi_app = RequestProfiler(app.wsgi_app)
+
+# Threads for the independent payload builders of a refresh
+app.config["REFRESH_WORKERS"] = int(os.environ.get("REFRESH_WORKERS", min(8, os.cpu_count() or 1)))
+build_pool = ThreadPoolExecutor(max_workers=app.config["REFRESH_WORKERS"], thread_name_prefix="refresh-build")
+
+# Request counts, latencies and response sizes per route
+request_metrics = RequestMetrics()
+request_metrics.init_app(app)
+
+# Timings of each refresh and of its loading and building stages
+refresh_stats = RefreshStats()
+
+# Shared tables, kept up to date incrementally; created by the first refresh
+store = None
+
+# Team members, persisted in SQLite; opened by create_app()
+team_store = None
+
+# Published snapshot of every payload; swapped atomically on each update
+snapshots = SnapshotRef()
+
+# Notices of new snapshots for streaming clients
+update_feed = UpdateFeed(snapshots.current)
+snapshots.subscribe(update_feed.publish)
+
+# Payloads of parameterized chart routes, keyed by query arguments and snapshot version
+response_cache = ResponseCache(maxsize=256)
+
+# Store revision of the published team payload
+team_revision = None
 
-# Load the data once into cache
-cache["sales_data"] = sales_df().to_dict(orient="records")
+# Publish a new team payload after a write. The store is read while holding the
+# publish lock, so the last write to publish always includes every committed write.
+def refresh_team_cache():
+    def update(current):
+        global team_revision
+        team_revision = team_store.revision()  # Read first: a concurrent write only makes it look stale
+        return current.evolve(payloads={"team_data": Payload.from_data(team_store.all())})
+    snapshots.publish(update)
+
+# Republish the team if another process has written to the shared database since
+def refresh_team_if_changed():
+    if team_store.revision() != team_revision:
+        refresh_team_cache()
+
+# Rows of the dashboard's latest transactions, newest first
+RECENT_SALES_ROWS = 50
 
 # Function to refresh data periodically
 def refresh_cache():
-    cache["team_data"] = pd.read_csv("data/team.csv").to_dict(orient="records")
-    cache["client_data"] = pd.read_csv("data/clients.csv").to_dict(orient="records")
-    cache["sales_data"] = sales_df().to_dict(orient="records")
-    cache["bar_chart_data"] = bar_chart_data()
-    cache["line_chart_data"] = line_chart_data()
-    cache["pie_chart_data"] = pie_chart_data()
-    cache["geo_chart_data"] = geo_chart_data()
-    cache["cards_data"] = convert_int64_to_int(cards_data()) # Refresh cards data
-    Timer(60, refresh_cache).start()  # Refresh every 60 seconds
-
-# Start the periodic refresh
-refresh_cache()
+    global store
+    # Team writes made by workers reach the process that refreshes (and forks them) here
+    refresh_team_if_changed()
+    from utils.data_processing import (bar_chart_data, line_chart_data, pie_chart_data, geo_chart_data,
+                                       dashboard_cards_data, convert_int64_to_int, sales_records)
+    from utils.data_store import DataStore, FACT_KEY_COLUMNS
+    from utils.kpis import KpiTable
+    from utils.records import ColumnarRecords
+    from utils.table_query import TableIndex
+    if store is None:
+        store = DataStore(app.config["DATA_DIR"], stage=refresh_stats.stage)
+
+    changed = store.load()  # Stat the sources; parse only what changed (or what a failed refresh left unpublished)
+    if changed:
+        # Build the new payloads off to the side, then publish them in one swap
+        previous = snapshots.current
+        sales, cube, traffic, clients = store.sales, store.cube, store.traffic_series, store.clients
+
+        # Monthly KPIs behind the cards, for every period at once
+        with refresh_stats.stage("build_kpis"):
+            kpis = KpiTable.build(cube, store.first_purchases, traffic)
+
+        # Records of the streamed tables, kept columnar; rows are only encoded while a response streams out
+        records = {}
+        with refresh_stats.stage("build_records"):
+            if changed & set(SALES_SOURCES):
+                records["sales"] = ColumnarRecords.build(sales, exclude=FACT_KEY_COLUMNS)
+            if CLIENTS_FILE in changed:
+                records["clients"] = ColumnarRecords.build(clients)
+
+        # Tagged by the fact table's sources, since its body is never held
+        def sales_payload():
+            etag = hashlib.blake2b(repr(store.sales_signature()).encode(), digest_size=16).hexdigest()
+            return StreamedPayload(records["sales"].json_chunks, etag)
+
+        # Independent builders over the shared tables, run concurrently
+        builders = {
+            "bar_chart_data": lambda: Payload.from_data(bar_chart_data(traffic)),
+            "line_chart_data": lambda: Payload.from_data(line_chart_data(cube)),
+            "pie_chart_data": lambda: Payload.from_data(pie_chart_data(cube)),
+            "geo_chart_data": lambda: Payload.from_data(geo_chart_data(cube)),
+            "cards_data": lambda: Payload.from_data(convert_int64_to_int(dashboard_cards_data(kpis))),
+        }
+        if changed & set(SALES_SOURCES):
+            builders["sales_data"] = sales_payload
+            builders["recent_sales"] = lambda: Payload.from_data(sales_records(sales.nlargest(RECENT_SALES_ROWS, 'saleId')))
+        if CLIENTS_FILE in changed:
+            builders["client_data"] = lambda: Payload.from_data(clients.to_dict(orient="records"))
+
+        with refresh_stats.stage("build_payloads"):
+            payloads = run_parallel(build_pool, builders, refresh_stats.stage)
+
+        tables = {"sales": TableIndex(sales)}
+        if CLIENTS_FILE in changed:
+            tables["clients"] = TableIndex(clients)
+
+        snapshot = snapshots.publish(lambda current: current.evolve(payloads=payloads, tables=tables, records=records,
+                                                                   cube=cube, kpis=kpis, traffic=traffic, live=True))
+        store.published()
+
+        # Saved for the next start to serve while its first refresh runs; the team comes from its own store
+        with refresh_stats.stage("save_snapshot"):
+            try:
+                save_snapshot(app.config["SNAPSHOT_DIR"], {name: payload for name, payload in snapshot.payloads.items()
+                                                           if name != "team_data"})
+            except OSError as e:
+                print(f"Error: could not save the snapshot: {e}")
+
+# Background refresh: one worker, runs never overlap
+scheduler = RefreshScheduler(refresh_cache, interval=app.config["REFRESH_INTERVAL"], stats=refresh_stats)
+
+# Answer for data the first refresh has not made live yet
+def loading_response():
+    return jsonify({"error": "Data is loading, try again shortly"}), 503, {"Retry-After": "1"}
+
+# Serve a payload of the given snapshot, tagged with its version
+def snapshot_response(snapshot, name):
+    if name not in snapshot.payloads:
+        return loading_response()
+    return payload_response(snapshot.payloads[name], version=snapshot.version)
+
+# Import the whole data layer up front. A process forked in the middle of an import
+# (a gunicorn worker forked while the refresh thread imports pandas, say) hangs the
+# next time it imports that module, so this runs before the refresh thread starts.
+def import_data_layer():
+    import utils.data_processing, utils.data_store, utils.export, utils.kpis, utils.records, utils.table_query, utils.traffic_series
+
+# Application factory for servers (see gunicorn.conf.py). Importing this module does no
+# work; starting it serves the payloads saved by the last run right away, while the
+# first refresh loads the current data in the background and then keeps it up to date.
+def create_app():
+    global team_store
+    import_data_layer()
+    team_store = TeamStore(app.config["DATA_DIR"])  # Creates (and may seed) the database
+    saved = load_snapshot(app.config["SNAPSHOT_DIR"])
+    if saved:
+        snapshots.publish(lambda current: current.evolve(payloads=saved))
+    refresh_team_cache()
+    scheduler.start(delay=0)
+    return app
+
+# Worker processes forked from a preloading server (see gunicorn.conf.py) inherit the
+# published snapshot. Locks a refresh thread may hold are taken across the fork, so
+# no worker starts with one of them locked.
+FORK_LOCKS = (snapshots.lock, refresh_stats.lock)
+os.register_at_fork(
+    before=lambda: [lock.acquire() for lock in FORK_LOCKS],
+    after_in_parent=lambda: [lock.release() for lock in FORK_LOCKS],
+    after_in_child=lambda: [lock.release() for lock in FORK_LOCKS],
+)
+
+# Readiness: 200 once fresh data is live, 503 while starting (when only saved payloads are served)
+@app.route('/api/_internal/ready', methods=['GET'])
+def get_ready():
+    snapshot = snapshots.current
+    body = {"ready": snapshot.live, "version": snapshot.version, "payloads": sorted(snapshot.payloads)}
+    return jsonify(body), 200 if snapshot.live else 503
+
+# API to retrieve refresh timings
+@app.route('/api/_internal/refresh_stats', methods=['GET'])
+def get_refresh_stats():
+    return jsonify({**refresh_stats.to_dict(), "interval": scheduler.interval, "version": snapshots.current.version})
+
+# Metrics in the Prometheus text format
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    text = MetricsText()
+    request_metrics.write(text)
+
+    text.family("dashboard_response_cache_hits_total", "counter", "Parameterized responses served from the response cache.",
+                [({}, response_cache.hits)])
+    text.family("dashboard_response_cache_misses_total", "counter", "Parameterized responses built on request.",
+                [({}, response_cache.misses)])
+
+    snapshot = snapshots.current
+    text.family("dashboard_snapshot_version", "gauge", "Version of the published snapshot.", [({}, snapshot.version)])
+    text.family("dashboard_snapshot_live", "gauge", "1 once a refresh has published data loaded from the sources.",
+                [({}, int(snapshot.live))])
+    text.family("dashboard_snapshot_age_seconds", "gauge", "Seconds since the published snapshot was built.",
+                [({}, time.time() - snapshot.created)])
+
+    stats = refresh_stats.to_dict()
+    text.family("dashboard_refresh_runs_total", "counter", "Refresh runs.", [({}, stats["runs"])])
+    text.family("dashboard_refresh_failures_total", "counter", "Refresh runs that raised.", [({}, stats["failures"])])
+    text.family("dashboard_refresh_skipped_total", "counter", "Refresh runs skipped while one was in progress.",
+                [({}, stats["skipped"])])
+    text.family("dashboard_refresh_duration_seconds", "gauge", "Duration of the last refresh run.",
+                [({}, stats["last_duration"])])
+    text.family("dashboard_refresh_last_finished_timestamp_seconds", "gauge", "Unix time the last refresh run finished.",
+                [({}, stats["last_finished"])])
+    text.family("dashboard_refresh_stage_seconds", "summary", "Duration of each refresh stage.",
+                [(suffix, {"stage": name}, stage[key])
+                 for name, stage in sorted(stats["stages"].items())
+                 for suffix, key in (("_sum", "total"), ("_count", "count"))])
+    text.family("dashboard_refresh_stage_last_seconds", "gauge", "Duration of each refresh stage in its last run.",
+                [({"stage": name}, stage["last"]) for name, stage in sorted(stats["stages"].items())])
+
+    return Response(text.render(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 # API to retrieve cards data
 @app.route('/api/cards_data', methods=['GET'])  # New endpoint for cards_data
 def get_cards_data():
     try:
-        data = cache["cards_data"]  # Fetch cards data from cache
-        return jsonify(data)
+        period = request.args.get('period')  # 'YYYY-MM'; defaults to the latest month with sales, as on the dashboard
+        snapshot = snapshots.current
+        if period is None:
+            return snapshot_response(snapshot, "cards_data")  # Serve cards data from the snapshot
+        if not snapshot.live:
+            return loading_response()
+        from utils.data_processing import cards_data, convert_int64_to_int
+        payload = response_cache.get(("cards", period), snapshot.version,
+                                     lambda: Payload.from_data(convert_int64_to_int(cards_data(snapshot.kpis, period))))
+        return payload_response(payload, version=snapshot.version)
+    except ValueError:
+        return jsonify({"error": f"Invalid period '{period}', expected YYYY-MM"}), 400
     except Exception as e:
         print(f"Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+# API to stream a notice of each data update (Server-Sent Events)
+@app.route('/api/stream', methods=['GET'])
+def get_stream():
+    # EventSource sends the id of the last notice it got when it reconnects
+    last_version = request.headers.get('Last-Event-ID', type=int)
+    if last_version is None:
+        last_version = request.args.get('version', type=int)
+    if app.config["STREAM_URL"]:
+        # Streams are held by the stream server, not by a worker thread
+        query = f"?version={last_version}" if last_version is not None else ""
+        return redirect(app.config["STREAM_URL"] + query, code=307)
+    return Response(update_feed.stream(last_version), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Dashboard widgets and the snapshot payloads behind them
+DASHBOARD_WIDGETS = {
+    "sales": "recent_sales",  # The latest RECENT_SALES_ROWS sales, not the whole table
+    "cards": "cards_data",
+    "line": "line_chart_data",
+    "bar": "bar_chart_data",
+    "pie": "pie_chart_data",
+    "geo": "geo_chart_data",
+    "team": "team_data",
+    "clients": "client_data",
+}
+DEFAULT_DASHBOARD_WIDGETS = "cards,line,bar,pie,geo"
+
+# API to retrieve several widgets at once, all from the same snapshot
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard():
+    widgets = tuple(sorted(set(request.args.get('widgets', DEFAULT_DASHBOARD_WIDGETS).split(','))))
+    unknown = [widget for widget in widgets if widget not in DASHBOARD_WIDGETS]
+    if unknown:
+        return jsonify({"error": f"Unknown widgets: {', '.join(unknown)}", "widgets": list(DASHBOARD_WIDGETS)}), 400
+
+    snapshot = snapshots.current
+    if any(DASHBOARD_WIDGETS[widget] not in snapshot.payloads for widget in widgets):
+        return loading_response()
+    payload = response_cache.get(("dashboard", widgets), snapshot.version,
+                                 lambda: join_payloads("widgets", {widget: snapshot.payloads[DASHBOARD_WIDGETS[widget]] for widget in widgets},
+                                                       version=snapshot.version))
+    return payload_response(payload, version=snapshot.version)
+
 # API to retrieve geo chart data
 @app.route('/api/geo_chart_data', methods=['GET'])
 def get_geo_chart_data():
     try:
-        data = cache["geo_chart_data"]  # Fetch geo chart data from cache
-        return jsonify(data)
+        year = request.args.get('year', type=int)
+        category = request.args.get('category')
+        snapshot = snapshots.current
+        if year is None and category is None:
+            return snapshot_response(snapshot, "geo_chart_data")  # Fetch geo chart data from the snapshot
+        if not snapshot.live:
+            return loading_response()
+        from utils.data_processing import geo_chart_data
+        payload = response_cache.get(("geo", year, category), snapshot.version,
+                                     lambda: Payload.from_data(geo_chart_data(snapshot.cube, year=year, category=category)))
+        return payload_response(payload, version=snapshot.version)
     except Exception as e:
         print(f"Error: {e}")
         return jsonify({"error": str(e)}), 500
@@ -61,34 +332,127 @@ def get_geo_chart_data():
 @app.route('/api/line_chart_data', methods=['GET'])
 def get_line_chart_data():
     year = request.args.get('year', type=int)  # Retrieve 'year' from query params
-    data = line_chart_data(year=year)
-    return jsonify(data)
+    country = request.args.get('country')
+    category = request.args.get('category')
+    snapshot = snapshots.current
+    if year is None and country is None and category is None:
+        return snapshot_response(snapshot, "line_chart_data")
+    if not snapshot.live:
+        return loading_response()
+    from utils.data_processing import line_chart_data
+    payload = response_cache.get(("line", year, country, category), snapshot.version,
+                                 lambda: Payload.from_data(line_chart_data(snapshot.cube, year=year, country=country, category=category)))
+    return payload_response(payload, version=snapshot.version)
 
 # API to retrieve bar chart data
 @app.route('/api/bar_chart_data', methods=['GET'])
 def get_bar_chart_data():
-    return jsonify(cache["bar_chart_data"])
+    snapshot = snapshots.current
+    if not request.args:
+        return snapshot_response(snapshot, "bar_chart_data")  # Monthly totals of all the traffic
+    if not snapshot.live:
+        return loading_response()
+    from utils.data_processing import bar_chart_data
+    from utils.traffic_series import parse_day_range
+    try:
+        start, end = parse_day_range(request.args)
+        granularity = request.args.get('granularity', 'month')
+        payload = response_cache.get(("bar", start, end, granularity), snapshot.version,
+                                     lambda: Payload.from_data(bar_chart_data(snapshot.traffic, start, end, granularity)))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return payload_response(payload, version=snapshot.version)
 
 # API to retrieve pie chart data
 @app.route('/api/pie_chart_data', methods=['GET'])
 def get_pie_chart_data():
-    data = pie_chart_data()  
-    return jsonify(data)
+    year = request.args.get('year', type=int)
+    country = request.args.get('country')
+    snapshot = snapshots.current
+    if year is None and country is None:
+        return snapshot_response(snapshot, "pie_chart_data")
+    if not snapshot.live:
+        return loading_response()
+    from utils.data_processing import pie_chart_data
+    payload = response_cache.get(("pie", year, country), snapshot.version,
+                                 lambda: Payload.from_data(pie_chart_data(snapshot.cube, year=year, country=country)))
+    return payload_response(payload, version=snapshot.version)
 
 # API to retrieve team data
 @app.route('/api/team_data', methods=['GET'])
 def get_team_data():
-    return jsonify(cache["team_data"])
+    # Another worker process may have written to the shared database
+    refresh_team_if_changed()
+    return snapshot_response(snapshots.current, "team_data")
+
+# Page of a table for requests with offset/limit/sort/cursor or column filter arguments
+def paginated_response(name, to_records):
+    snapshot = snapshots.current
+    if name not in snapshot.tables:
+        return loading_response()
+    try:
+        page, page_info = snapshot.tables[name].query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return payload_response(Payload.from_data({"rows": to_records(page), **page_info}), version=snapshot.version)
 
 # API to retrieve client data
 @app.route('/api/client_data', methods=['GET'])
 def get_client_data():
-    return jsonify(cache["client_data"])
+    if request.args:
+        return paginated_response("clients", lambda page: page.to_dict(orient="records"))
+    return snapshot_response(snapshots.current, "client_data")
+
+# Records of a page of the sales table; only called once the table is loaded
+def page_sales_records(page):
+    from utils.data_processing import sales_records
+    return sales_records(page)
 
 # API to retrieve sales data
 @app.route('/api/sales_data', methods=['GET'])
 def get_sales_data():
-    return jsonify(cache["sales_data"])
+    if request.args:
+        return paginated_response("sales", page_sales_records)
+    return snapshot_response(snapshots.current, "sales_data")
+
+# Exportable tables and the date field their from/to arguments filter on
+EXPORT_DATE_FIELDS = {
+    "sales": "saleDate",
+    "clients": None,
+}
+
+# API to export a whole table, streamed in fixed-size chunks (?format=ndjson|csv&from=&to=)
+@app.route('/api/export/<name>', methods=['GET'])
+def export_table(name):
+    if name not in EXPORT_DATE_FIELDS:
+        return jsonify({"error": f"Unknown table '{name}'", "tables": list(EXPORT_DATE_FIELDS)}), 404
+    snapshot = snapshots.current  # The records of one snapshot, however long the download takes
+    if name not in snapshot.records:
+        return loading_response()
+    from utils.export import EXPORT_FORMATS, export_chunks
+    from utils.traffic_series import parse_day_range
+
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format '{export_format}', expected one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        start, end = parse_day_range(request.args)
+        date_field = EXPORT_DATE_FIELDS[name]
+        if date_field is None and (start is not None or end is not None):
+            raise ValueError(f"The {name} table has no date to filter on")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    body = export_chunks(snapshot.records[name], export_format, date_field=date_field, start=start, end=end)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{name}.{export_format}"',
+        "X-Data-Version": str(snapshot.version),
+        "Vary": "Accept-Encoding",
+    }
+    if request.accept_encodings.best_match(["gzip"]):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, content_type=EXPORT_FORMATS[export_format], headers=headers)
 
 # API to add new user
 @app.route('/api/users', methods=['POST'])
@@ -103,32 +467,18 @@ def add_user():
             if field not in data or not data[field]:
                 return jsonify({"error": f"Field '{field}' is required"}), 400
 
-        # Load team data
-        team_file = "data/team.csv"
-        try:
-            team_data = pd.read_csv(team_file)
-        except FileNotFoundError:
-            team_data = pd.DataFrame(columns=["id", "firstName", "lastName", "email", "phone", "role", "access"])
-
-        # Determine next ID
-        next_id = team_data["id"].max() + 1 if not team_data.empty else 1
-
-        # Append the new user
+        # Insert the new user; the store allocates the next id
         new_user = {
-            "id": next_id,
             "name": data["firstName"] + " " + data["lastName"],
             "email": data["email"],
             "phone": data["contact"],
             "role": data["role"],
             "access": data["accessLevel"]
         }
-        team_data = pd.concat([team_data, pd.DataFrame([new_user])], ignore_index=True)
-
-        # Save updated team data
-        team_data.to_csv(team_file, index=False)
+        next_id = team_store.add(new_user)
 
         # Refresh cache
-        cache["team_data"] = team_data.to_dict(orient="records")
+        refresh_team_cache()
 
         return jsonify({"message": "User successfully added", "id": int(next_id)}), 201
 
@@ -140,25 +490,12 @@ def add_user():
 @app.route('/api/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
     try:
-        # Load team data
-        team_file = "data/team.csv"
-        try:
-            team_data = pd.read_csv(team_file)
-        except FileNotFoundError:
-            return jsonify({"error": "Team data file not found"}), 404
-
-        # Check if the user exists
-        if user_id not in team_data["id"].values:
+        # Delete the user, if it exists
+        if not team_store.delete(user_id):
             return jsonify({"error": f"User with ID {user_id} not found"}), 404
 
-        # Delete the user
-        team_data = team_data[team_data["id"] != user_id]
-
-        # Save updated team data
-        team_data.to_csv(team_file, index=False)
-
         # Refresh cache
-        cache["team_data"] = team_data.to_dict(orient="records")
+        refresh_team_cache()
 
         return jsonify({"message": f"User with ID {user_id} successfully deleted"}), 200
 
@@ -167,4 +504,8 @@ def delete_user(user_id):
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
+    # The debug reloader runs this file in a parent process that only watches files,
+    # and again in the serving child (WERKZEUG_RUN_MAIN=true); only the child starts
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        create_app()
     app.run(debug=True)
@@ -0,0 +1,340 @@
+"""Benchmarks of the data pipeline and the API routes at several dataset sizes.
+
+    python benchmark.py                                   # 50k, 1M and 10M sales rows
+    python benchmark.py --scales 50000 --output bench.json
+    python benchmark.py --baseline bench.json             # Exit 1 on a regression
+
+Fixtures are generated once per size with data/mockDataGenerators/generate.py
+and reused. Each size runs in its own process, so peak memory is measured per
+size and a size that runs out of memory doesn't take the others down with it;
+results gathered before a crash are kept.
+
+For each size the results hold the ingest and load times, the median time and
+peak allocation of each builder, the startup refresh with its stage timings,
+the boot time of a fresh server process (with and without a saved snapshot),
+request latencies of every GET /api/* route (through the Flask test client)
+and the peak RSS of the process.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR = os.path.join(SERVER_DIR, "data", "mockDataGenerators", "generate.py")
+DEFAULT_SCALES = "50000,1000000,10000000"
+DEFAULT_FIXTURES_DIR = os.path.join(tempfile.gettempdir(), "dashboard-benchmark")
+
+# Files copied into every fixture as they are
+STATIC_FILES = ("products.csv", "team.csv")
+
+# Routes that never finish a response, left out of the load test
+STREAMING_ROUTES = {"/api/stream"}
+
+# Parameterized requests load-tested besides the bare routes
+EXTRA_REQUESTS = [
+    "/api/cards_data?period=2023-05",
+    "/api/line_chart_data?year=2023&country=Brazil",
+    "/api/pie_chart_data?year=2024",
+    "/api/bar_chart_data?from=2024-01-01&to=2024-11-29&granularity=week",
+    "/api/geo_chart_data?year=2022&category=Electronics",
+    "/api/sales_data?limit=100&sort=-finalPrice",
+    "/api/client_data?limit=100&country=Brazil",
+    "/api/dashboard?widgets=cards,line,geo",
+    "/api/export/sales?format=csv&from=2024-01-01&to=2024-03-31",
+    "/api/export/clients?format=ndjson",
+]
+
+# Figures compared against a baseline: the steadier ones, not medians or tail latencies
+COMPARED_METRICS = {"min_s", "ingest_s", "mmap_s", "startup_s", "boot_s", "full_s", "p50_ms", "peak_alloc_mb", "peak_rss_mb"}
+
+# Slowdowns smaller than this many seconds are noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+## FIXTURES ##
+def ensure_fixture(fixtures_dir, rows, seed):
+    """Directory with a dataset of `rows` sales, generated on first use."""
+    path = os.path.join(fixtures_dir, f"sales-{rows}-seed-{seed}")
+    marker = os.path.join(path, ".complete")
+    if os.path.exists(marker):
+        return path, None
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    for name in STATIC_FILES:
+        shutil.copy(os.path.join(SERVER_DIR, "data", name), path)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, GENERATOR, "--data-dir", path, "--sales", str(rows), "--seed", str(seed)],
+                   check=True, stdout=subprocess.DEVNULL)
+    generate_seconds = time.perf_counter() - start
+    open(marker, "w").close()
+    return path, generate_seconds
+
+
+## MEASUREMENTS (run in a child process per size) ##
+# Run in a fresh interpreter: seconds until the app is started, then until its data is live
+BOOT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import app
+app.create_app()
+boot = time.perf_counter() - start
+while not app.snapshots.current.live:
+    time.sleep(0.005)
+print(json.dumps({"boot_s": boot, "live_s": time.perf_counter() - start}))
+"""
+
+
+def measure_boot(snapshot_dir):
+    env = {**os.environ, "SNAPSHOT_DIR": snapshot_dir}
+    completed = subprocess.run([sys.executable, "-c", BOOT_SCRIPT], cwd=SERVER_DIR, env=env,
+                               check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+
+def time_builder(build, repeat):
+    """Median and minimum seconds of `repeat` runs, then the peak traced allocation of one more."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build()
+        durations.append(time.perf_counter() - start)
+    tracemalloc.start()
+    build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_s": statistics.median(durations), "min_s": min(durations), "runs": repeat,
+            "peak_alloc_mb": peak / 2**20}
+
+
+def load_test(client_factory, url, requests, concurrency):
+    """Latency percentiles and throughput of `requests` GETs of `url`."""
+    headers = {"Accept-Encoding": "gzip, br"}
+
+    def worker(count):
+        client = client_factory()
+        latencies, size = [], 0
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.get(url, headers=headers)
+            body = response.get_data()
+            latencies.append(time.perf_counter() - start)
+            size = len(body)
+            status = response.status_code
+        return latencies, size, status
+
+    shares = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, [share for share in shares if share]))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for worker_latencies, _, _ in results for latency in worker_latencies)
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        "status": results[0][2],
+        "requests": len(latencies),
+        "bytes": results[0][1],
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "rps": len(latencies) / elapsed,
+    }
+
+
+def run_child(fixture, output, repeat, requests, concurrency):
+    """Benchmark one fixture, rewriting `output` after each phase."""
+    results = {}
+
+    def save():
+        results["peak_rss_mb"] = peak_rss_mb()
+        with open(output, "w") as f:
+            json.dump(results, f)
+
+    sys.path.insert(0, SERVER_DIR)
+    from utils.columnar import COLUMNAR_DIR
+    from utils.data_store import FACT_KEY_COLUMNS, DataStore, load_sales_fact
+    from utils.cube import SalesCube
+    from utils.first_purchase import FirstPurchaseIndex
+    from utils.kpis import KpiTable
+    from utils.traffic_series import TrafficSeries
+    from utils.data_processing import bar_chart_data, line_chart_data, pie_chart_data, geo_chart_data, cards_data
+    from utils.records import ColumnarRecords
+
+    # Loading: from the CSVs (as after a data change), then from the columnar copies
+    shutil.rmtree(os.path.join(fixture, COLUMNAR_DIR), ignore_errors=True)
+    start = time.perf_counter()
+    DataStore(fixture).load()
+    ingest = time.perf_counter() - start
+    store = DataStore(fixture)
+    start = time.perf_counter()
+    store.load()
+    results["load"] = {"ingest_s": ingest, "mmap_s": time.perf_counter() - start, "sales_rows": len(store.sales)}
+    save()
+
+    # Builders, cheapest first; encoding every sale record is the largest
+    kpis = KpiTable.build(store.cube, store.first_purchases, store.traffic_series)
+    year = int(store.cube.axis_labels('year').max())
+    builders = {
+        "build_cube": lambda: SalesCube.build(store.sales),
+        "build_first_purchases": lambda: FirstPurchaseIndex.build(store.sales),
+        "build_traffic_series": lambda: TrafficSeries.build(store.traffic),
+        "build_kpis": lambda: KpiTable.build(store.cube, store.first_purchases, store.traffic_series),
+        "cards_data": lambda: cards_data(kpis),
+        "bar_chart_data": lambda: bar_chart_data(store.traffic_series),
+        "line_chart_data": lambda: line_chart_data(store.cube),
+        "pie_chart_data": lambda: pie_chart_data(store.cube, year=year),
+        "geo_chart_data": lambda: geo_chart_data(store.cube),
+        "load_sales_fact": lambda: load_sales_fact(fixture),
+        "sales_records": lambda: ColumnarRecords.build(store.sales, exclude=FACT_KEY_COLUMNS),
+        "encode_sales_records": lambda: sum(len(chunk) for chunk in
+                                            ColumnarRecords.build(store.sales, exclude=FACT_KEY_COLUMNS).json_chunks()),
+    }
+    results["builders"] = {}
+    for name, build in builders.items():
+        results["builders"][name] = time_builder(build, repeat)
+        save()
+    del store, kpis
+
+    # Startup: the first refresh loads the data and publishes (and saves) every payload
+    start = time.perf_counter()
+    import app
+    app.create_app()
+    while not app.snapshots.current.live:
+        time.sleep(0.005)
+    results["refresh"] = {"startup_s": time.perf_counter() - start, "stages": app.refresh_stats.to_dict()["stages"]}
+    save()
+
+    # Fresh server processes: with nothing saved, then serving the payloads saved above
+    with tempfile.TemporaryDirectory() as empty:
+        results["boot"] = {"cold": measure_boot(empty), "warm": measure_boot(app.app.config["SNAPSHOT_DIR"])}
+    save()
+
+    # Every GET route, as served from the published snapshot
+    urls = sorted(rule.rule for rule in app.app.url_map.iter_rules()
+                  if rule.rule.startswith("/api/") and "GET" in rule.methods
+                  and not rule.arguments and rule.rule not in STREAMING_ROUTES)
+    results["routes"] = {}
+    for url in urls + EXTRA_REQUESTS:
+        results["routes"][url] = load_test(app.app.test_client, url, requests, concurrency)
+        save()
+
+    # A full refresh of every payload, as after the sources are replaced
+    app.store.signatures = {}
+    start = time.perf_counter()
+    app.scheduler.trigger()
+    results["refresh"]["full_s"] = time.perf_counter() - start
+    save()
+    app.scheduler.stop()
+
+
+## COMPARISON ##
+def flatten(results, prefix=""):
+    """{"scale/section/name/metric": value} of the figures compared against a baseline."""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            if key != "stages":
+                flat.update(flatten(value, path))
+        elif key in COMPARED_METRICS:
+            flat[path] = value
+    return flat
+
+
+def compare(results, baseline, tolerance):
+    """Metrics that got worse than the baseline by more than `tolerance` (a fraction)."""
+    current, previous = flatten(results["scales"]), flatten(baseline["scales"])
+    regressions = []
+    for path, value in sorted(current.items()):
+        old = previous.get(path)
+        if old is None or value <= old * (1 + tolerance):
+            continue
+        seconds = (value - old) / 1000 if path.endswith("_ms") else value - old
+        if not path.endswith("_mb") and seconds < MIN_REGRESSION_SECONDS:
+            continue
+        regressions.append({"metric": path, "baseline": old, "current": value, "ratio": value / old if old else None})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard server at several dataset sizes.")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"Comma-separated sales row counts (default: {DEFAULT_SCALES})")
+    parser.add_argument("--fixtures-dir", default=DEFAULT_FIXTURES_DIR, help=f"Where generated datasets are kept (default: {DEFAULT_FIXTURES_DIR})")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the generated datasets (default: 42)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per builder (default: 3)")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per route (default: 50)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent test clients per route (default: 1)")
+    parser.add_argument("--output", help="Write the JSON results here as well as to stdout")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a metric counts as a regression (default: 0.25)")
+    parser.add_argument("--child", metavar="FIXTURE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.output, args.repeat, args.requests, args.concurrency)
+        return
+
+    import numpy
+    import pandas
+    results = {
+        "meta": {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pandas.__version__,
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "scales": {},
+    }
+    for rows in (int(scale) for scale in args.scales.split(",")):
+        fixture, generate_seconds = ensure_fixture(args.fixtures_dir, rows, args.seed)
+        with tempfile.NamedTemporaryFile(suffix=".json") as partial:
+            env = {**os.environ, "DATA_DIR": fixture, "REFRESH_INTERVAL": "86400"}
+            command = [sys.executable, os.path.abspath(__file__), "--child", fixture, "--output", partial.name,
+                       "--repeat", str(args.repeat), "--requests", str(args.requests), "--concurrency", str(args.concurrency)]
+            completed = subprocess.run(command, cwd=SERVER_DIR, env=env)
+            scale = json.loads(partial.read() or b"{}")
+        if generate_seconds is not None:
+            scale["fixture"] = {"generate_s": generate_seconds}
+        if completed.returncode != 0:
+            scale["error"] = f"benchmark process exited with status {completed.returncode}"
+        results["scales"][str(rows)] = scale
+        print(f"{rows} rows: {scale.get('error', 'done')}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["regressions"] = compare(results, json.load(f), args.tolerance)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+    if results.get("regressions"):
+        for regression in results["regressions"]:
+            print(f"Regression: {regression['metric']} {regression['baseline']:.4g} -> {regression['current']:.4g}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
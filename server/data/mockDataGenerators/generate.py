@@ -0,0 +1,251 @@
+"""Mock data generator for the dashboard server.
+
+Writes sales.csv, clients.csv, products.csv and site_traffic.csv into server/data
+(the files the server reads), in vectorized chunks so tens of millions of rows
+never have to fit in memory at once. Output is reproducible: the same seed and
+arguments give the same files.
+
+    python generate.py                          # The default 50k-sale dataset
+    python generate.py --sales 10000000         # 10M sales rows
+    python generate.py --tables sales --sales 100000000 --clients 1000000
+    python generate.py --append 5000            # Append a batch of sales continuing sales.csv
+"""
+import argparse
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Rows generated and written per chunk
+CHUNK_ROWS = 1_000_000
+
+TABLES = ("products", "clients", "traffic", "sales")
+
+# Keys that give each table its own random stream
+STREAMS = {"products": 1, "clients": 2, "traffic": 3, "sales": 4}
+
+# List of valid countries
+VALID_COUNTRIES = [
+    "United States", "Canada", "Mexico", "Brazil", "Argentina", "United Kingdom", "France",
+    "Germany", "Italy", "Spain", "Russia", "China", "Japan", "South Korea", "India",
+    "Australia", "New Zealand", "South Africa", "Egypt", "Nigeria", "Turkey", "Saudi Arabia",
+    "Indonesia", "Thailand", "Vietnam", "Philippines", "Malaysia", "Singapore", "Bangladesh",
+    "Pakistan", "Afghanistan", "Ukraine", "Poland", "Netherlands", "Belgium", "Sweden",
+    "Norway", "Denmark", "Finland", "Switzerland", "Austria", "Greece", "Portugal",
+    "Czech Republic", "Hungary", "Romania", "Chile", "Colombia", "Peru", "Venezuela",
+    "Iran", "Iraq", "Israel", "United Arab Emirates", "Qatar", "Kuwait", "Kazakhstan",
+    "Uzbekistan", "Myanmar", "Morocco", "Algeria", "Kenya"
+]
+
+FIRST_NAMES = np.array([
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Ana",
+    "Luis", "Maria", "Wei", "Mei", "Hiroshi", "Yuki", "Ahmed", "Fatima", "Ivan", "Olga",
+    "Raj", "Priya", "Lucas", "Sofia", "Noah", "Emma", "Ali", "Leila", "Jonas", "Ingrid",
+])
+LAST_NAMES = np.array([
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Silva", "Santos", "Wang", "Li", "Zhang", "Tanaka", "Sato", "Kim", "Lee", "Nguyen",
+    "Khan", "Hassan", "Ivanov", "Petrov", "Muller", "Schmidt", "Rossi", "Dubois", "Kowalski", "Novak",
+    "Patel", "Sharma", "Andersen", "Nielsen", "Jansen", "Costa", "Lopez", "Gonzalez", "Perez", "Wilson",
+])
+STREETS = np.array([
+    "Main St", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln", "Elm St", "Lake View", "Hill Rd",
+    "Park Ave", "River Rd", "Sunset Blvd", "Church St", "High St", "Station Rd", "Market St", "Mill Ln",
+])
+CITIES = np.array([
+    "Springfield", "Riverside", "Fairview", "Greenville", "Franklin", "Clinton", "Madison", "Georgetown",
+    "Salem", "Bristol", "Newport", "Ashland", "Milton", "Oxford", "Dover", "Kingston",
+])
+
+# Suffix of generated product variants, so a catalog is never expanded twice
+VARIANT_SUFFIX = re.compile(r" \(v\d+\)$")
+
+
+def rng_for(seed, table, first_row):
+    """Random stream for the chunk of `table` starting at row id `first_row`."""
+    return np.random.default_rng([seed, STREAMS[table], first_row])
+
+
+def chunks(total, start=1):
+    """(first id, row count) of each chunk of `total` rows, with ids from `start`."""
+    for first in range(start, start + total, CHUNK_ROWS):
+        yield first, min(CHUNK_ROWS, start + total - first)
+
+
+def write_csv(path, frames, append=False):
+    """Write DataFrame chunks to `path`.
+
+    A new file is written next to `path` and renamed over it at the end, so the
+    server never reads a half-written file. Appended chunks go straight to the
+    end of the existing file, as complete lines.
+    """
+    if append:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 1))
+            ends_with_newline = size == 0 or f.read(1) == b"\n"
+        with open(path, "a", newline="") as f:
+            if not ends_with_newline:
+                f.write("\n")
+            for frame in frames:
+                frame.to_csv(f, header=False, index=False)
+        return
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", newline="") as f:
+        for position, frame in enumerate(frames):
+            frame.to_csv(f, header=position == 0, index=False)
+    os.replace(tmp_path, path)
+
+
+## PRODUCTS ##
+def product_frames(catalog, count, seed):
+    """The catalog's products, then priced variants of them up to `count` products."""
+    catalog = catalog[~catalog["model"].str.contains(VARIANT_SUFFIX)].reset_index(drop=True)
+    catalog["id"] = np.arange(1, len(catalog) + 1)
+    yield catalog.head(count)
+    for first, size in chunks(count - len(catalog), start=len(catalog) + 1):
+        rng = rng_for(seed, "products", first)
+        ids = np.arange(first, first + size)
+        base = catalog.iloc[(ids - 1) % len(catalog)].reset_index(drop=True)
+        variant = (ids - 1) // len(catalog) + 1
+        yield pd.DataFrame({
+            "id": ids,
+            "brand": base["brand"],
+            "model": base["model"] + " (v" + pd.Series(variant).astype(str) + ")",
+            "category": base["category"],
+            "price": ((base["price"] * rng.uniform(0.8, 1.2, size)).round(0) - 0.01).round(2),
+        })
+
+
+## CLIENTS ##
+def client_frames(count, seed):
+    for first, size in chunks(count):
+        rng = rng_for(seed, "clients", first)
+        ids = np.arange(first, first + size)
+        id_text = pd.Series(ids).astype(str)
+        first_names = pd.Series(FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), size)])
+        last_names = pd.Series(LAST_NAMES[rng.integers(0, len(LAST_NAMES), size)])
+        yield pd.DataFrame({
+            "id": ids,
+            "registerId": "CL" + id_text.str.zfill(3),
+            "name": first_names + " " + last_names,
+            "age": rng.integers(18, 81, size),
+            "phone": "555-" + pd.Series(rng.integers(0, 10_000, size)).astype(str).str.zfill(4),
+            "email": (first_names + "." + last_names).str.lower() + id_text + "@example.com",
+            "address": pd.Series(rng.integers(1, 10_000, size)).astype(str) + " " + STREETS[rng.integers(0, len(STREETS), size)],
+            "city": CITIES[rng.integers(0, len(CITIES), size)],
+            "zipCode": pd.Series(rng.integers(0, 100_000, size)).astype(str).str.zfill(5),
+            "country": np.array(VALID_COUNTRIES)[rng.integers(0, len(VALID_COUNTRIES), size)],
+        })
+
+
+## TRAFFIC ##
+def traffic_frames(start, end, seed):
+    # One row per day
+    days = pd.date_range(start, end, freq="D")
+    for first, size in chunks(len(days)):
+        rng = rng_for(seed, "traffic", first)
+        inbound_traffic = rng.integers(100, 5001, size)  # Random visits per day
+        yield pd.DataFrame({
+            "date": days[first - 1:first - 1 + size].strftime("%Y-%m-%d"),
+            "inbound_traffic": inbound_traffic,
+            "unique_visitors": rng.integers(50, inbound_traffic + 1),  # Unique visitors <= inbound traffic
+            "avg_session_duration": rng.uniform(30, 600, size).round(2),  # Average session time in seconds
+        })
+
+
+## SALES ##
+def sales_frames(count, start, end, clients, product_ids, seed, first_id=1):
+    """`count` sales with ids from `first_id`, dates evenly spread from `start` to `end` in id order."""
+    start_day = np.datetime64(start, "D")
+    date_range = int((np.datetime64(end, "D") - start_day).astype(int))
+    for first, size in chunks(count, start=first_id):
+        rng = rng_for(seed, "sales", first)
+        position = np.arange(first - first_id, first - first_id + size, dtype=np.int64)
+        dates = start_day + (position * date_range // count).astype("timedelta64[D]")
+        yield pd.DataFrame({
+            "id": np.arange(first, first + size),
+            "client_id": rng.integers(1, clients + 1, size),
+            "product_id": product_ids[rng.integers(0, len(product_ids), size)],
+            "quantity": rng.integers(1, 5, size),
+            "date": np.datetime_as_string(dates, unit="D"),
+        })
+
+
+def last_sale(path):
+    """(id, date) of the last row of a sales file, read from its end."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 4096))
+        last_line = f.read().rstrip(b"\n").rsplit(b"\n", 1)[-1].decode()
+    fields = last_line.split(",")
+    return int(fields[0]), fields[-1]
+
+
+def count_rows(path):
+    with open(path, "rb") as f:
+        return sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b"")) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate mock dashboard data into server/data.")
+    parser.add_argument("--tables", default="clients,traffic,sales",
+                        help=f"Comma-separated tables to write, of {', '.join(TABLES)} (default: clients,traffic,sales)")
+    parser.add_argument("--sales", type=int, default=50_000, help="Sales rows (default: 50000)")
+    parser.add_argument("--clients", type=int, default=100_000, help="Clients (default: 100000)")
+    parser.add_argument("--products", type=int, default=None,
+                        help="Products: the catalog in products.csv plus generated variants (default: the catalog)")
+    parser.add_argument("--start", default="2018-01-01", help="First sale and traffic date (default: 2018-01-01)")
+    parser.add_argument("--end", default="2024-11-29", help="Last sale and traffic date (default: 2024-11-29)")
+    parser.add_argument("--append", type=int, metavar="ROWS",
+                        help="Instead, append ROWS sales dated from the last sale's day to --append-days after it")
+    parser.add_argument("--append-days", type=int, default=1, help="Days an appended batch spans (default: 1)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Output directory (default: server/data)")
+    args = parser.parse_args()
+
+    path = lambda name: os.path.join(args.data_dir, name)
+    started = time.perf_counter()
+
+    if args.append:
+        # A batch of new sales continuing the ids and dates of sales.csv
+        last_id, last_date = last_sale(path("sales.csv"))
+        clients = count_rows(path("clients.csv"))
+        product_ids = pd.read_csv(path("products.csv"), usecols=["id"])["id"].to_numpy()
+        end = (np.datetime64(last_date, "D") + np.timedelta64(args.append_days, "D")).astype(str)
+        write_csv(path("sales.csv"),
+                  sales_frames(args.append, last_date, end, clients, product_ids, args.seed, first_id=last_id + 1),
+                  append=True)
+        print(f"Appended {args.append} sales (ids {last_id + 1}-{last_id + args.append}) "
+              f"in {time.perf_counter() - started:.1f}s")
+        return
+
+    tables = args.tables.split(",")
+    unknown = set(tables) - set(TABLES)
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+
+    # Products first: sales sample from their ids
+    if "products" in tables:
+        catalog = pd.read_csv(path("products.csv"))
+        write_csv(path("products.csv"), product_frames(catalog, args.products or len(catalog), args.seed))
+    if "clients" in tables:
+        write_csv(path("clients.csv"), client_frames(args.clients, args.seed))
+    if "traffic" in tables:
+        write_csv(path("site_traffic.csv"), traffic_frames(args.start, args.end, args.seed))
+    if "sales" in tables:
+        clients = args.clients if "clients" in tables else count_rows(path("clients.csv"))
+        product_ids = pd.read_csv(path("products.csv"), usecols=["id"])["id"].to_numpy()
+        write_csv(path("sales.csv"),
+                  sales_frames(args.sales, args.start, args.end, clients, product_ids, args.seed))
+
+    print(f"Wrote {', '.join(tables)} to {os.path.abspath(args.data_dir)} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
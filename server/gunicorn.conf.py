@@ -0,0 +1,57 @@
+# Production server: gunicorn -c gunicorn.conf.py (run from the server directory)
+#
+# The app is started once in the master process, which serves the payloads saved
+# by the last run straight away, loads the current data in the background and runs
+# the only refresh scheduler. Workers are forked from it and share the snapshot's
+# memory copy-on-write (the tables themselves are memory-mapped columnar files);
+# they never refresh on their own. When the master publishes a new snapshot, the
+# first fresh one included, it reloads gracefully, and the new workers are forked
+# with the new snapshot while the old ones finish their requests. A worker that
+# writes to the team publishes only in its own process; the others see the new
+# revision of the shared database, and the master republishes it on its next refresh.
+#
+# Event streams (/api/stream) are served by a separate asyncio process on
+# STREAM_BIND (see utils/stream_server.py), fed with each snapshot's update notice
+# by the master: open streams hold no worker thread and survive the reloads. The
+# workers redirect /api/stream to STREAM_URL, which defaults to that address.
+import gc
+import os
+import signal
+
+wsgi_app = "app:create_app()"
+bind = os.environ.get("BIND", "127.0.0.1:5000")
+stream_bind = os.environ.get("STREAM_BIND", "127.0.0.1:5001")
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "gthread"
+threads = int(os.environ.get("WORKER_THREADS", 4))
+preload_app = True
+graceful_timeout = 30
+
+
+def when_ready(server):
+    import app
+    from utils.stream_server import StreamProcess
+    app.app.config["STREAM_URL"] = app.app.config["STREAM_URL"] or f"http://{stream_bind}/api/stream"
+
+    # Kept on the arbiter: a reload runs this file again
+    server.stream_process = StreamProcess(stream_bind)
+    server.stream_process.start()
+
+    def on_publish(snapshot):
+        # Workers inherit this subscriber, and publish their own team writes: those stay local
+        if os.getpid() != server.pid:
+            return
+        server.stream_process.post(*app.update_feed.state())  # The feed subscribed first, so it is up to date
+        os.kill(os.getpid(), signal.SIGHUP)  # Reload the workers onto the new snapshot
+
+    app.snapshots.subscribe(on_publish)
+    server.stream_process.post(*app.update_feed.state())  # Whatever was published before (older notices are dropped)
+
+
+def on_exit(server):
+    server.stream_process.stop()
+
+
+def pre_fork(server, worker):
+    # Keep the preloaded objects out of the collector, so it does not touch (and copy) their pages
+    gc.freeze()
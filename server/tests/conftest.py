@@ -0,0 +1,72 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Tests import the server modules the way app.py does, from the server directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+COUNTRIES = ["Brazil", "Canada", "France", "Japan"]
+CATEGORIES = ["Books", "Camera", "Laptops"]
+
+# Product id of the sale whose product is missing from products.csv
+UNKNOWN_PRODUCT_ID = 9999
+
+
+def make_products(count=12):
+    return pd.DataFrame({
+        "id": np.arange(1, count + 1),
+        "brand": [f"Brand {i % 5}" for i in range(count)],
+        "model": [f"Model {i}" for i in range(count)],
+        "category": [CATEGORIES[i % len(CATEGORIES)] for i in range(count)],
+        "price": np.round(np.linspace(9.99, 999.99, count), 2),
+    })
+
+
+def make_clients(count=40):
+    return pd.DataFrame({
+        "id": np.arange(1, count + 1),
+        "registerId": [f"CL{i:03d}" for i in range(1, count + 1)],
+        "name": [f"Client {i % 17}" for i in range(count)],
+        "age": 20 + np.arange(count) % 50,
+        "phone": [f"555-{i:04d}" for i in range(count)],
+        "email": [f"client{i}@example.com" for i in range(count)],
+        "address": [f"{i} Main St" for i in range(count)],
+        "city": ["Springfield"] * count,
+        "zipCode": 10000 + np.arange(count),
+        "country": [COUNTRIES[i % len(COUNTRIES)] for i in range(count)],
+    })
+
+
+def make_sales(count, first_id=1, seed=0, start="2023-01-01", days=700, products=12, clients=40):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp(start) + pd.to_timedelta(np.sort(rng.integers(0, days, count)), unit="D")
+    return pd.DataFrame({
+        "id": np.arange(first_id, first_id + count),
+        "client_id": rng.integers(1, clients + 1, count),
+        "product_id": rng.integers(1, products + 1, count),
+        "quantity": rng.integers(1, 5, count),
+        "date": dates.strftime("%Y-%m-%d"),
+    })
+
+
+def write_sources(path):
+    """Write small products, clients, sales and traffic sources into `path`."""
+    make_products().to_csv(path / "products.csv", index=False)
+    make_clients().to_csv(path / "clients.csv", index=False)
+    make_sales(500).to_csv(path / "sales.csv", index=False)
+    days = pd.date_range("2023-01-01", periods=700, freq="D")
+    pd.DataFrame({
+        "date": days.strftime("%Y-%m-%d"),
+        "inbound_traffic": np.arange(len(days)) % 300 + 100,
+        "unique_visitors": np.arange(len(days)) % 200 + 50,
+        "avg_session_duration": np.round(np.arange(len(days)) % 60 + 30.5, 1),
+    }).to_csv(path / "site_traffic.csv", index=False)
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A data directory with small products, clients, sales and traffic sources."""
+    return write_sources(tmp_path)
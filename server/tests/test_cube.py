@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from conftest import UNKNOWN_PRODUCT_ID, make_clients, make_products, make_sales
+from utils.cube import SalesCube
+from utils.data_store import build_sales_fact
+
+
+def sales_fact(sales):
+    return build_sales_fact(sales, make_products(), make_clients())
+
+
+def with_unknown_product(sales):
+    row = sales.iloc[[-1]].assign(id=sales["id"].max() + 1, product_id=UNKNOWN_PRODUCT_ID)
+    return pd.concat([sales, row], ignore_index=True)
+
+
+def assert_matches_groupby(cube, fact, by):
+    expected = fact.groupby(list(by), observed=True).agg(
+        finalPrice=("finalPrice", "sum"), orders=("saleId", "size"), quantity=("saleQuantity", "sum"))
+    rolled = cube.rollup(by=by)
+    np.testing.assert_allclose(rolled["finalPrice"].to_numpy(), expected["finalPrice"].to_numpy())
+    np.testing.assert_array_equal(rolled["orders"].to_numpy(), expected["orders"].to_numpy())
+    np.testing.assert_array_equal(rolled["quantity"].to_numpy(), expected["quantity"].to_numpy())
+
+
+def test_rollups_match_pandas():
+    fact = sales_fact(make_sales(800))
+    cube = SalesCube.build(fact)
+    for by in [("year",), ("year", "month"), ("productCategory",), ("year", "clientCountry")]:
+        assert_matches_groupby(cube, fact, by)
+
+
+def test_unknown_product_counts_as_an_order_without_income():
+    fact = sales_fact(with_unknown_product(make_sales(800)))
+    assert fact["finalPrice"].isna().sum() == 1
+
+    cube = SalesCube.build(fact)
+    assert not np.isnan(cube.cells).any()
+    assert_matches_groupby(cube, fact, ("year", "month"))
+    assert cube.total("finalPrice") == fact["finalPrice"].sum()
+    # Left out of the category breakdown, like a groupby on a missing key
+    assert cube.rollup(by=("productCategory",))["orders"].sum() == len(fact) - 1
+
+
+def test_added_cubes_equal_one_cube_of_all_rows():
+    sales = with_unknown_product(make_sales(900))
+    first, second = sales.iloc[:600], sales.iloc[600:]
+    added = SalesCube.build(sales_fact(first)).add(SalesCube.build(sales_fact(second)))
+    whole = SalesCube.build(sales_fact(sales))
+    for by in [("year", "month"), ("productCategory",), ("clientCountry",)]:
+        pd.testing.assert_frame_equal(added.rollup(by=by), whole.rollup(by=by))
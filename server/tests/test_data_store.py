@@ -0,0 +1,65 @@
+import pandas as pd
+from conftest import UNKNOWN_PRODUCT_ID, make_sales
+from utils.data_store import DataStore, FACT_KEY_COLUMNS
+from utils.records import ColumnarRecords
+from utils.sources import SALES_FILE
+
+
+def append_sales(data_dir, sales):
+    sales.to_csv(data_dir / SALES_FILE, mode="a", header=False, index=False)
+
+
+def loaded(data_dir):
+    store = DataStore(str(data_dir))
+    store.load()
+    store.published()
+    return store
+
+
+def records_body(store):
+    return b"".join(ColumnarRecords.build(store.sales, exclude=FACT_KEY_COLUMNS).json_chunks())
+
+
+def test_appended_load_equals_a_full_reload(data_dir):
+    store = loaded(data_dir)
+
+    # Older purchases move some clients' first month back; one sale has an unknown product
+    appended = make_sales(300, first_id=501, seed=1, start="2022-10-01", days=900)
+    appended.loc[appended.index[-1], "product_id"] = UNKNOWN_PRODUCT_ID
+    append_sales(data_dir, appended)
+    assert store.load() == {SALES_FILE}
+    assert len(store.appended) == len(appended)
+
+    reloaded = loaded(data_dir)
+    assert reloaded.appended is None
+
+    for by in [("year", "month"), ("productCategory",), ("clientCountry",), ("year", "productCategory")]:
+        pd.testing.assert_frame_equal(store.cube.rollup(by=by), reloaded.cube.rollup(by=by))
+    assert store.first_purchases.histogram == reloaded.first_purchases.histogram
+    assert records_body(store) == records_body(reloaded)
+
+
+def test_partial_last_line_waits_for_the_next_load(data_dir):
+    store = loaded(data_dir)
+    with open(data_dir / SALES_FILE, "a") as f:
+        f.write("501,3,4,2,2024-12-01\n502,5,")
+    store.load()
+    assert store.sales["saleId"].iloc[-1] == 501
+
+    with open(data_dir / SALES_FILE, "a") as f:
+        f.write("6,1,2024-12-02\n")
+    store.load()
+    assert list(store.sales["saleId"].iloc[-2:]) == [501, 502]
+    assert records_body(store) == records_body(loaded(data_dir))
+
+
+def test_changes_are_reported_until_published(data_dir):
+    store = loaded(data_dir)
+    assert store.load() == set()
+
+    append_sales(data_dir, make_sales(10, first_id=501, seed=2))
+    assert store.load() == {SALES_FILE}
+    assert store.load() == {SALES_FILE}  # Not served yet, say because the refresh failed
+    assert len(store.sales) == 510
+    store.published()
+    assert store.load() == set()
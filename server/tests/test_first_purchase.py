@@ -0,0 +1,18 @@
+import pandas as pd
+from conftest import make_clients, make_products, make_sales
+from utils.data_store import build_sales_fact
+from utils.first_purchase import FirstPurchaseIndex
+
+
+def sales_fact(sales):
+    return build_sales_fact(sales, make_products(), make_clients())
+
+
+def test_added_rows_give_the_index_built_from_all_rows():
+    first = make_sales(400)
+    # Older purchases move clients' first month back, emptying some months
+    second = make_sales(200, first_id=401, seed=1, start="2022-06-01", days=300)
+    added = FirstPurchaseIndex.build(sales_fact(first)).add(sales_fact(second))
+    whole = FirstPurchaseIndex.build(sales_fact(pd.concat([first, second], ignore_index=True)))
+    assert added.histogram == whole.histogram
+    assert added.first_months.sort_index().equals(whole.first_months.sort_index())
@@ -0,0 +1,56 @@
+import json
+from utils.live_updates import UpdateFeed
+from utils.payloads import Payload
+from utils.snapshot import SnapshotRef
+from utils.stream_server import StreamServer
+
+
+def notice_data(message):
+    return json.loads(message.split(b"data: ", 1)[1])
+
+
+def publish(snapshots, **data):
+    # Every payload is rebuilt, like a refresh does, whether or not its data changed
+    return snapshots.publish(lambda current: current.evolve(
+        payloads={name: Payload.from_data(value) for name, value in data.items()}))
+
+
+def test_rebuilt_payloads_with_the_same_body_are_not_reported_as_changed():
+    snapshots = SnapshotRef()
+    feed = UpdateFeed(snapshots.current)
+    snapshots.subscribe(feed.publish)
+    publish(snapshots, cards_data={"visitors": 10}, geo_chart_data=[1, 2])
+    publish(snapshots, cards_data={"visitors": 11}, geo_chart_data=[1, 2])
+
+    version, notice, catchup = feed.state()
+    assert version == 2
+    assert notice_data(notice)["changed"] == ["cards_data"]
+    assert notice_data(catchup)["changed"] == ["cards_data", "geo_chart_data"]
+
+
+def test_reconnecting_streams_get_what_they_missed():
+    snapshots = SnapshotRef()
+    feed = UpdateFeed(snapshots.current)
+    snapshots.subscribe(feed.publish)
+    for visitors in (10, 11, 12):
+        publish(snapshots, cards_data={"visitors": visitors})
+
+    one_behind = feed.stream(2)
+    assert next(one_behind).startswith(b"retry:")
+    assert notice_data(next(one_behind)) == {"changed": ["cards_data"], "version": 3,
+                                             "payloads": {"cards_data": {"visitors": 12}}}
+
+    far_behind = feed.stream(0)
+    next(far_behind)
+    assert next(far_behind) == feed.catchup
+
+
+def test_stream_server_sends_each_step_or_a_catch_up():
+    server = StreamServer()
+    server.post(1, None, b"catchup-1")
+    sent = []
+    server.broadcast = sent.append
+    server.post(2, b"notice-2", b"catchup-2")
+    server.post(2, b"notice-2", b"catchup-2")  # Late duplicate
+    server.post(4, None, b"catchup-4")
+    assert sent == [b"notice-2", b"catchup-4"]
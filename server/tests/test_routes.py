@@ -0,0 +1,132 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+import pytest
+from conftest import make_sales, write_sources
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """A test client of the started app, once its first refresh over the test sources is done."""
+    data_dir = write_sources(tmp_path_factory.mktemp("data"))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Read when app.py is imported; the tests run any later refresh themselves
+        monkeypatch.setenv("DATA_DIR", str(data_dir))
+        monkeypatch.setenv("REFRESH_INTERVAL", "3600")
+        monkeypatch.delenv("SNAPSHOT_DIR", raising=False)
+        app = importlib.import_module("app")
+    assert app.app.config["DATA_DIR"] == str(data_dir)
+    app.create_app()
+    deadline = time.monotonic() + 30
+    while app.refresh_stats.to_dict()["runs"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert app.snapshots.current.live
+    return app.app.test_client()
+
+
+def test_importing_the_app_does_no_work():
+    code = ("import sys, app; "
+            "assert app.team_store is None and 'pandas' not in sys.modules, sorted(sys.modules)")
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=server_dir, check=True,
+                   env={**os.environ, "DATA_DIR": os.path.join(server_dir, "no-such-dir")})
+
+
+@pytest.mark.parametrize("route", ["/api/sales_data", "/api/client_data"])
+@pytest.mark.parametrize("query", ["bogus=1", "limit=ten", "offset=-1", "sort=-bogus", "cursor=not-a-cursor",
+                                   "id__between=1", "city__gte=x&bogus__lte=y"])
+def test_invalid_query_arguments_get_a_400(client, route, query):
+    response = client.get(f"{route}?{query}")
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+@pytest.mark.parametrize("query", ["saleDate__gte=someday", "saleQuantity=many", "finalPrice__lte=cheap"])
+def test_filter_values_of_the_wrong_type_get_a_400(client, query):
+    response = client.get(f"/api/sales_data?{query}")
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_valid_filters_page_the_sales(client):
+    response = client.get("/api/sales_data?sort=-saleId&limit=5&clientCountry=Japan")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body["rows"]) == 5
+    assert {row["clientCountry"] for row in body["rows"]} == {"Japan"}
+    assert [row["saleId"] for row in body["rows"]] == sorted((row["saleId"] for row in body["rows"]), reverse=True)
+
+
+@pytest.mark.parametrize("route", ["/api/bar_chart_data", "/api/export/sales"])
+@pytest.mark.parametrize("query", ["from=2023-02-30", "to=yesterday", "from=2023-01-01&to=2023-13-01",
+                                   "from=2024", "to=2024-05", "from=20230201", "from=2023-1-5"])
+def test_invalid_date_ranges_get_a_400(client, route, query):
+    response = client.get(f"{route}?{query}")
+    assert response.status_code == 400
+    assert "Invalid date" in response.get_json()["error"]
+
+
+def test_export_keeps_the_days_of_the_range(client):
+    response = client.get("/api/export/sales?format=ndjson&from=2023-03-01&to=2023-03-31")
+    assert response.status_code == 200
+    days = {json.loads(line)["saleDate"] for line in response.get_data().splitlines()}
+    assert days and min(days) >= "2023-03-01" and max(days) <= "2023-03-31"
+
+
+def test_a_failed_refresh_is_redone_by_the_next_one(client, monkeypatch):
+    import app
+    import utils.data_processing
+    sales_file = os.path.join(app.app.config["DATA_DIR"], "sales.csv")
+    make_sales(20, first_id=501, seed=3).to_csv(sales_file, mode="a", header=False, index=False)
+
+    def broken(cube):
+        raise RuntimeError("builder failed")
+    monkeypatch.setattr(utils.data_processing, "geo_chart_data", broken)
+    version = app.snapshots.current.version
+    with pytest.raises(RuntimeError):
+        app.refresh_cache()
+    assert app.snapshots.current.version == version
+    monkeypatch.undo()
+
+    app.refresh_cache()
+    snapshot = app.snapshots.current
+    assert snapshot.version > version
+    assert len(snapshot.records["sales"]) == len(app.store.sales) == 520
+    assert client.get("/api/sales_data?sort=-saleId&limit=1").get_json()["rows"][0]["saleId"] == 520
+
+
+def test_dashboard_sales_widget_is_the_latest_transactions(client):
+    widgets = client.get("/api/dashboard?widgets=sales,cards").get_json()["widgets"]
+    latest = client.get("/api/sales_data?sort=-saleId&limit=50").get_json()["rows"]
+    assert widgets["sales"] == latest
+    assert "cards" in widgets
+
+
+def test_dashboard_defaults_leave_out_the_sales(client):
+    widgets = client.get("/api/dashboard").get_json()["widgets"]
+    assert sorted(widgets) == ["bar", "cards", "geo", "line", "pie"]
+
+
+def test_default_cards_are_the_latest_month_with_sales(client):
+    import app
+    cards = client.get("/api/cards_data").get_json()
+    assert cards["period"] == app.store.sales["saleDate"].max().strftime("%Y-%m")
+    # The first dashboard's key names, kept on the default cards only
+    assert cards["november_orders"] == cards["orders"]
+    assert cards["annual_income_2024"] == cards["annual_income"]
+
+
+def test_cards_of_a_period_use_period_neutral_keys(client):
+    import app
+    sales = app.store.sales
+    cards = client.get("/api/cards_data?period=2023-05").get_json()
+    in_year = sales[sales["saleDate"].dt.year == 2023]
+    in_month = in_year[in_year["saleDate"].dt.month == 5]
+    assert cards["period"] == "2023-05"
+    assert cards["orders"] == len(in_month)
+    assert cards["income"] == pytest.approx(in_month["finalPrice"].sum())
+    assert cards["annual_income"] == pytest.approx(in_year["finalPrice"].sum())
+    assert not [key for key in cards if key.startswith("november_") or key == "annual_income_2024"]
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import UNKNOWN_PRODUCT_ID, make_clients, make_products, make_sales
+from utils.data_store import build_sales_fact
+from utils.table_query import TableIndex
+
+
+@pytest.fixture
+def table():
+    sales = make_sales(600)
+    sales.loc[[7, 300], "product_id"] = UNKNOWN_PRODUCT_ID  # No price or category
+    fact = build_sales_fact(sales, make_products(), make_clients())
+    # Text columns as they come back from the columnar copies: categoricals
+    return fact.assign(clientName=fact["clientName"].astype("category"))
+
+
+def test_range_filters_on_text_columns_compare_as_strings(table):
+    index = TableIndex(table)
+    for column in ("clientName", "clientCountry", "productCategory"):
+        values = table[column].astype(str).where(table[column].notna())
+        np.testing.assert_array_equal(index.mask({f"{column}__gte": "C"}), (values >= "C").to_numpy())
+        np.testing.assert_array_equal(index.mask({f"{column}__lte": "C"}), (values <= "C").to_numpy())
+
+
+def test_range_filters_on_numbers_and_dates(table):
+    index = TableIndex(table)
+    np.testing.assert_array_equal(index.mask({"finalPrice__gte": "500"}), (table["finalPrice"] >= 500).to_numpy())
+    np.testing.assert_array_equal(index.mask({"saleDate__lte": "2023-06-30"}),
+                                  (table["saleDate"] <= pd.Timestamp("2023-06-30")).to_numpy())
+
+
+@pytest.mark.parametrize("args", [
+    {"nope": "1"},
+    {"finalPrice__between": "1"},
+    {"finalPrice__gte": "cheap"},
+    {"saleDate__lte": "someday"},
+    {"sort": "nope"},
+    {"limit": "ten"},
+    {"offset": "-1"},
+    {"cursor": "not-a-cursor"},
+])
+def test_invalid_arguments_raise_value_error(table, args):
+    with pytest.raises(ValueError):
+        TableIndex(table).query(args)
+
+
+def page_through(index, limit=37, **args):
+    """saleIds of every page, following next_cursor from the first page to the last."""
+    ids, cursor = [], None
+    while True:
+        page, info = index.query({**args, "limit": str(limit), **({"cursor": cursor} if cursor else {})})
+        ids.extend(page["saleId"])
+        cursor = info["next_cursor"]
+        if cursor is None:
+            return ids, info["total"]
+
+
+@pytest.mark.parametrize("sort", [None, "saleDate", "-saleDate", "clientName", "-clientName",
+                                  "clientCountry", "-clientCountry", "saleQuantity", "-saleQuantity",
+                                  "finalPrice", "-finalPrice"])
+def test_cursor_paging_returns_each_row_once(table, sort):
+    index = TableIndex(table)
+    args = {"sort": sort} if sort else {}
+    ids, total = page_through(index, **args)
+    assert total == len(table)
+    assert ids == list(index.query({**args, "limit": str(len(table))})[0]["saleId"])
+    assert sorted(ids) == sorted(table["saleId"])
+
+
+@pytest.mark.parametrize("sort", ["saleDate", "-saleDate", "-finalPrice"])
+def test_cursor_paging_with_a_filter(table, sort):
+    index = TableIndex(table)
+    ids, total = page_through(index, limit=10, sort=sort, productCategory="Camera")
+    expected = table.loc[table["productCategory"] == "Camera", "saleId"]
+    assert total == len(expected) == len(ids)
+    assert sorted(ids) == sorted(expected)
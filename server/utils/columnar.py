@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+COLUMNAR_DIR = "columnar"
+MANIFEST_FILE = "manifest.json"
+
+
+## WRITING ##
+def codes_dtype(size):
+    """Smallest signed code dtype for `size` distinct values, the one pandas itself uses for categories."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def write_table(frame, path, metadata=None):
+    """Write `frame` as one .npy file per column plus a JSON manifest.
+
+    Numeric, boolean and datetime columns are stored as-is. Categorical and
+    text columns are dictionary-encoded: integer codes plus a fixed-width array
+    of the distinct values. The table is written next to `path` and swapped in
+    with renames, so readers never see a half-written directory.
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for position, name in enumerate(frame.columns):
+        series = frame[name]
+        stem = os.path.join(tmp_path, f"{position}")
+        if isinstance(series.dtype, pd.CategoricalDtype) or not (
+            pd.api.types.is_numeric_dtype(series.dtype)
+            or pd.api.types.is_bool_dtype(series.dtype)
+            or pd.api.types.is_datetime64_any_dtype(series.dtype)
+        ):
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+            else:
+                codes, categories = pd.factorize(series, sort=True)
+            np.save(f"{stem}.codes.npy", codes.astype(codes_dtype(len(categories))))
+            np.save(f"{stem}.categories.npy", np.asarray(categories, dtype=str))
+            columns.append({"name": name, "kind": "category"})
+        else:
+            np.save(f"{stem}.npy", series.to_numpy())
+            columns.append({"name": name, "kind": "array"})
+
+    with open(os.path.join(tmp_path, MANIFEST_FILE), "w") as f:
+        json.dump({"rows": len(frame), "columns": columns, "metadata": metadata or {}}, f)
+
+    # Swap directories; memory maps of the old files stay valid until released
+    old_path = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+## READING ##
+def read_manifest(path):
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def read_table(path, manifest=None):
+    """Memory-map a table written by `write_table`. Returns (DataFrame, metadata).
+
+    Column data stays in the page cache: arrays are mapped read-only and
+    wrapped without copying.
+    """
+    manifest = manifest or read_manifest(path)
+    data = {}
+    for position, column in enumerate(manifest["columns"]):
+        stem = os.path.join(path, f"{position}")
+        if column["kind"] == "category":
+            codes = np.load(f"{stem}.codes.npy", mmap_mode="r")
+            categories = np.load(f"{stem}.categories.npy")
+            data[column["name"]] = pd.Categorical.from_codes(codes, categories=categories, validate=False)
+        else:
+            data[column["name"]] = np.load(f"{stem}.npy", mmap_mode="r")
+    return pd.DataFrame(data, copy=False), manifest["metadata"]
+
+
+def load_cached(path, sources, build):
+    """Memory-map the columnar table at `path` if it was built from `sources`.
+
+    `sources` maps source file names to their current signatures. Otherwise
+    `build()` is called to import the sources, returning (DataFrame, metadata);
+    the result is written to `path` and mapped back in, so the parsed copy can
+    be freed.
+    """
+    sources = {name: list(signature) if signature else None for name, signature in sources.items()}
+    manifest = read_manifest(path)
+    if manifest is None or manifest["metadata"].get("sources") != sources:
+        frame, metadata = build()
+        write_table(frame, path, {**metadata, "sources": sources})
+        del frame
+        manifest = None
+    return read_table(path, manifest)
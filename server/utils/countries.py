@@ -0,0 +1,53 @@
+import pandas as pd
+
+# ISO 3166-1 alpha-3 codes of the client countries (VALID_COUNTRIES in
+# data/mockDataGenerators/generate.py) and of common aliases.
+COUNTRY_CODES = {
+    "Afghanistan": "AFG", "Algeria": "DZA", "Argentina": "ARG", "Australia": "AUS",
+    "Austria": "AUT", "Bangladesh": "BGD", "Belgium": "BEL", "Brazil": "BRA",
+    "Canada": "CAN", "Chile": "CHL", "China": "CHN", "Colombia": "COL",
+    "Czech Republic": "CZE", "Denmark": "DNK", "Egypt": "EGY", "Finland": "FIN",
+    "France": "FRA", "Germany": "DEU", "Greece": "GRC", "Hungary": "HUN",
+    "India": "IND", "Indonesia": "IDN", "Iran": "IRN", "Iraq": "IRQ",
+    "Israel": "ISR", "Italy": "ITA", "Japan": "JPN", "Kazakhstan": "KAZ",
+    "Kenya": "KEN", "Kuwait": "KWT", "Malaysia": "MYS", "Mexico": "MEX",
+    "Morocco": "MAR", "Myanmar": "MMR", "Netherlands": "NLD", "New Zealand": "NZL",
+    "Nigeria": "NGA", "Norway": "NOR", "Pakistan": "PAK", "Peru": "PER",
+    "Philippines": "PHL", "Poland": "POL", "Portugal": "PRT", "Qatar": "QAT",
+    "Romania": "ROU", "Russia": "RUS", "Saudi Arabia": "SAU", "Singapore": "SGP",
+    "South Africa": "ZAF", "South Korea": "KOR", "Spain": "ESP", "Sweden": "SWE",
+    "Switzerland": "CHE", "Thailand": "THA", "Turkey": "TUR", "Ukraine": "UKR",
+    "United Arab Emirates": "ARE", "United Kingdom": "GBR", "United States": "USA",
+    "Uzbekistan": "UZB", "Venezuela": "VEN", "Vietnam": "VNM",
+    # Aliases
+    "Burma": "MMR", "Czechia": "CZE", "Great Britain": "GBR", "Holland": "NLD",
+    "Korea": "KOR", "Republic of Korea": "KOR", "Russian Federation": "RUS",
+    "The Netherlands": "NLD", "Turkiye": "TUR", "Türkiye": "TUR", "UAE": "ARE",
+    "UK": "GBR", "United States of America": "USA", "US": "USA", "USA": "USA",
+    "Viet Nam": "VNM",
+}
+
+
+def lookup_country_code(name):
+    """Resolve a name missing from COUNTRY_CODES with pycountry, remembering the answer."""
+    import pycountry  # Loads its country database; only needed for unknown names
+
+    try:
+        code = pycountry.countries.lookup(name).alpha_3
+    except LookupError:
+        print(f"Country '{name}' not found in ISO 3166-1 alpha-3 codes.")
+        code = None
+    COUNTRY_CODES[name] = code
+    return code
+
+
+def country_codes(countries):
+    """ISO alpha-3 codes for a Series of country names; None where a name is not a country.
+
+    Categorical series are mapped once per category rather than once per row.
+    """
+    names = countries.cat.categories if isinstance(countries.dtype, pd.CategoricalDtype) else countries.unique()
+    for name in names:
+        if name not in COUNTRY_CODES:
+            lookup_country_code(name)
+    return countries.map(COUNTRY_CODES)
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+# Cube axes, in storage order (after the leading measure axis)
+DIMENSIONS = ("year", "month", "productCategory", "clientCountry")
+
+# Measures summed into every cell
+MEASURES = ("finalPrice", "orders", "quantity")
+
+MONTHS = np.arange(1, 13)
+
+
+def _year_span(*year_axes):
+    """Contiguous range of years covering every non-empty axis."""
+    years = [axis for axis in year_axes if len(axis)]
+    if not years:
+        return np.array([], dtype=np.int64)
+    return np.arange(min(axis.min() for axis in years), max(axis.max() for axis in years) + 1, dtype=np.int64)
+
+
+def _positions(labels, union):
+    """Positions of `labels` inside `union`, followed by the trailing unknown slot."""
+    return np.append(pd.Index(union).get_indexer(labels), len(union))
+
+
+## SALES CUBE ##
+class SalesCube:
+    """Dense year x month x category x country cube of sales measures.
+
+    `cells` has shape (measure, year, month, category + 1, country + 1); the
+    extra last slot of the category and country axes holds sales whose product
+    or client is unknown, so totals still include them while breakdowns by
+    category or country leave them out (as a pandas groupby would).
+    """
+
+    def __init__(self, years, categories, countries, cells):
+        self.years = pd.Index(years, name="year")
+        self.categories = pd.Index(categories, name="productCategory")
+        self.countries = pd.Index(countries, name="clientCountry")
+        self.cells = cells
+
+    @classmethod
+    def build(cls, fact):
+        """Aggregate the sales fact table into a cube in one vectorized pass."""
+        categories = fact['productCategory'].cat.categories
+        countries = fact['clientCountry'].cat.categories
+
+        years = _year_span(fact['year'])
+
+        shape = (len(years), len(MONTHS), len(categories) + 1, len(countries) + 1)
+
+        # Missing dimensions (code -1) go to the trailing unknown slot
+        category_codes = fact['productCategory'].cat.codes.to_numpy().astype(np.int64)
+        category_codes[category_codes < 0] = len(categories)
+        country_codes = fact['clientCountry'].cat.codes.to_numpy().astype(np.int64)
+        country_codes[country_codes < 0] = len(countries)
+
+        flat = np.ravel_multi_index(
+            (
+                fact['year'].to_numpy().astype(np.int64) - (years[0] if len(years) else 0),
+                fact['month'].to_numpy().astype(np.int64) - 1,
+                category_codes,
+                country_codes,
+            ),
+            shape,
+        )
+        size = int(np.prod(shape))
+        # A sale of an unknown product has no price; count it as 0, as a pandas sum skips NaN
+        cells = np.stack([
+            np.bincount(flat, weights=np.nan_to_num(fact['finalPrice'].to_numpy(dtype=np.float64)), minlength=size),
+            np.bincount(flat, minlength=size).astype(np.float64),
+            np.bincount(flat, weights=np.nan_to_num(fact['saleQuantity'].to_numpy(dtype=np.float64)), minlength=size),
+        ]).reshape((len(MEASURES),) + shape)
+
+        return cls(years, categories, countries, cells)
+
+    def add(self, other):
+        """A new cube holding the cells of both cubes, aligned on the union of their axes."""
+        years = _year_span(self.years, other.years)
+        categories = self.categories.union(other.categories)
+        countries = self.countries.union(other.countries)
+
+        cells = np.zeros((len(MEASURES), len(years), len(MONTHS), len(categories) + 1, len(countries) + 1))
+        for cube in (self, other):
+            index = np.ix_(
+                np.arange(len(MEASURES)),
+                pd.Index(years).get_indexer(cube.years),
+                np.arange(len(MONTHS)),
+                _positions(cube.categories, categories),
+                _positions(cube.countries, countries),
+            )
+            cells[index] += cube.cells
+
+        return SalesCube(years, categories, countries, cells)
+
+    def axis_labels(self, dimension):
+        return {
+            "year": self.years,
+            "month": pd.Index(MONTHS, name="month"),
+            "productCategory": self.categories,
+            "clientCountry": self.countries,
+        }[dimension]
+
+    def rollup(self, by=(), **filters):
+        """Measures summed over every dimension not in `by`, sliced by `filters`.
+
+        Filters are labels (e.g. year=2024, clientCountry="Brazil"); a None filter
+        is ignored. Returns a DataFrame indexed by the `by` dimensions with one
+        row per non-empty cell.
+        """
+        index = [slice(None)]
+        by_labels = {}
+        for dimension in DIMENSIONS:
+            labels = self.axis_labels(dimension)
+            value = filters.get(dimension)
+            if value is not None:
+                position = labels.get_indexer([value])[0]
+                if position < 0:
+                    return self._frame(np.zeros((len(MEASURES), 0)), [self.axis_labels(d)[:0] for d in by], by)
+                index.append(slice(position, position + 1))
+                by_labels[dimension] = labels[position:position + 1]
+            elif dimension in by:
+                index.append(slice(0, len(labels)))  # Leave out the unknown slot
+                by_labels[dimension] = labels
+            else:
+                index.append(slice(None))
+
+        cells = self.cells[tuple(index)]
+        summed_axes = tuple(i + 1 for i, dimension in enumerate(DIMENSIONS) if dimension not in by)
+        cells = cells.sum(axis=summed_axes)
+
+        # Order the remaining axes as requested in `by`
+        remaining = [dimension for dimension in DIMENSIONS if dimension in by]
+        cells = np.moveaxis(cells, [remaining.index(d) + 1 for d in by], range(1, len(by) + 1))
+
+        return self._frame(cells.reshape(len(MEASURES), -1), [by_labels[d] for d in by], by)
+
+    def total(self, measure, **filters):
+        """Single measure summed over the cells matching `filters`."""
+        return self.rollup(**filters)[measure].sum()
+
+    @staticmethod
+    def _frame(cells, labels, by):
+        if by:
+            index = pd.MultiIndex.from_product(labels, names=list(by)) if len(by) > 1 else labels[0]
+        else:
+            index = None
+        frame = pd.DataFrame(dict(zip(MEASURES, cells)), index=index)
+        frame = frame[frame['orders'] > 0]
+        return frame.astype({'orders': 'int64', 'quantity': 'int64'})
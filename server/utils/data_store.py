@@ -0,0 +1,279 @@
+import base64
+import io
+import os
+from contextlib import nullcontext
+import pandas as pd
+from utils.columnar import COLUMNAR_DIR, load_cached
+from utils.cube import SalesCube
+from utils.first_purchase import FirstPurchaseIndex
+from utils.sources import (DATA_DIR, SALES_FILE, PRODUCTS_FILE, CLIENTS_FILE, TRAFFIC_FILE,
+                           SOURCE_FILES, SALES_SOURCES)
+from utils.traffic_series import TrafficSeries
+
+# Bytes before the sales tail offset used to detect a rewritten (not appended) file
+TAIL_FINGERPRINT_BYTES = 64
+
+# Low-cardinality dimensions stored as pandas categoricals
+CATEGORICAL_COLUMNS = ["clientCountry", "productCategory", "productBrand"]
+
+# Columns the fact table adds for grouping, left out of the records the API sends
+FACT_KEY_COLUMNS = ("year", "month")
+
+# Column names used by the frontend for the joined sales table
+SALES_COLUMN_NAMES = {
+    'id_x': 'saleId',  # Keep saleId from the sales file
+    'name': 'clientName',
+    'age': 'clientAge',
+    'phone': 'clientPhone',
+    'email': 'clientEmail',
+    'address': 'clientAddress',
+    'city': 'clientCity',
+    'zipCode': 'clientZipCode',
+    'country': 'clientCountry',
+    'brand': 'productBrand',
+    'model': 'productModel',
+    'category': 'productCategory',
+    'price': 'productPrice',
+    'quantity': 'saleQuantity',
+    'date': 'saleDate'
+}
+
+
+## SOURCE VERSIONING ##
+def file_signature(path):
+    """Return (mtime_ns, size) for a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_tail_fingerprint(path, offset):
+    """Bytes just before `offset`; unchanged as long as the file was only appended to."""
+    start = max(0, offset - TAIL_FINGERPRINT_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(offset - start)
+
+
+## FACT TABLE ##
+def build_sales_fact(sales, products, clients):
+    """Join raw sales, products and clients into the typed sales fact table."""
+    # Merge sales with products on product_id
+    merged_df = pd.merge(sales, products, left_on="product_id", right_on="id", how="left")
+
+    # Merge the result with clients on client_id
+    merged_df = pd.merge(merged_df, clients, left_on="client_id", right_on="id", how="left")
+
+    # Calculate the final price
+    merged_df['finalPrice'] = (merged_df['quantity'] * merged_df['price']).round(2)
+
+    # Drop unnecessary columns (like product_id and client_id) but keep saleId
+    merged_df = merged_df.drop(columns=[col for col in ['product_id', 'id_y', 'id'] if col in merged_df.columns])
+    merged_df = merged_df.rename(columns=SALES_COLUMN_NAMES)
+
+    # Typed columns: parsed dates, categorical dimensions and year/month keys
+    merged_df['saleDate'] = pd.to_datetime(merged_df['saleDate'])
+    for col in CATEGORICAL_COLUMNS:
+        merged_df[col] = merged_df[col].astype("category")
+    merged_df['year'] = merged_df['saleDate'].dt.year.astype("int16")
+    merged_df['month'] = merged_df['saleDate'].dt.month.astype("int8")
+
+    return merged_df
+
+
+def load_sales_fact(data_dir=DATA_DIR):
+    sales = pd.read_csv(os.path.join(data_dir, SALES_FILE))
+    products = pd.read_csv(os.path.join(data_dir, PRODUCTS_FILE))
+    clients = pd.read_csv(os.path.join(data_dir, CLIENTS_FILE))
+    return build_sales_fact(sales, products, clients)
+
+
+def read_traffic_csv(data_dir=DATA_DIR):
+    return pd.read_csv(os.path.join(data_dir, TRAFFIC_FILE), parse_dates=['date'])
+
+
+def add_traffic_keys(traffic):
+    # Extract year-month from the date
+    traffic['year_month'] = traffic['date'].dt.to_period('M')
+
+    return traffic
+
+
+def load_traffic(data_dir=DATA_DIR):
+    return add_traffic_keys(read_traffic_csv(data_dir))
+
+
+def concat_fact(fact, new_rows):
+    """Append fact rows into a new table, keeping categorical columns categorical.
+
+    `fact` itself is left untouched, since published snapshots may still read it.
+    """
+    fact_columns, new_columns = {}, {}
+    for col in fact.columns:
+        if not isinstance(fact[col].dtype, pd.CategoricalDtype):
+            continue
+        new_values = new_rows[col].astype("category")
+        categories = fact[col].cat.categories.union(new_values.cat.categories, sort=False)
+        fact_columns[col] = fact[col].cat.set_categories(categories)
+        new_columns[col] = new_values.cat.set_categories(categories)
+    return pd.concat([fact.assign(**fact_columns), new_rows.assign(**new_columns)], ignore_index=True)
+
+
+## DATA STORE ##
+class DataStore:
+    """Shared tables, loaded once and then kept up to date incrementally.
+
+    Each source is tracked by its (mtime, size) signature. When only sales.csv
+    grew, the rows after the last parsed byte offset are read, joined and folded
+    into the fact table and the sales cube; any other change triggers
+    a full reload. Unchanged sources cost one stat() each. Changes are
+    reported by every load until `published()` confirms they were served,
+    so a refresh that fails after loading does not lose them.
+
+    CSV files are only an import path: a full load memory-maps the columnar
+    copies under data/columnar (see utils/columnar.py), importing a CSV
+    only when its columnar copy was built from an older version of it.
+
+    `stage(name)`, if given, is a context manager factory used to time the
+    individual loading steps.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, stage=None):
+        self.data_dir = data_dir
+        self.stage = stage or (lambda name: nullcontext())
+        self.version = 0
+        self.signatures = {}
+        self.sales_columns = None
+        self.sales_offset = 0
+        self.sales_tail = b""
+        self.products = None
+        self.clients = None
+        self.sales = None
+        self.traffic = None
+        self.traffic_series = None
+        self.cube = None
+        self.first_purchases = None
+        self.appended = None  # Fact rows added by the last incremental load
+        self.unpublished = set()  # Sources changed since the last published() call
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def load(self):
+        """Bring the tables up to date. Returns the set of source files changed since the last `published()`."""
+        signatures = {name: file_signature(self.path(name)) for name in SOURCE_FILES}
+        changed = {name for name in SOURCE_FILES if signatures[name] != self.signatures.get(name)}
+        if not changed:
+            return set(self.unpublished)
+
+        self.appended = None
+        if changed == {TRAFFIC_FILE}:
+            self.load_traffic(signatures)
+        elif changed != {SALES_FILE} or not self.try_append(signatures[SALES_FILE]):
+            self.load_full(signatures)
+
+        self.signatures = signatures
+        self.version += 1
+        self.unpublished |= changed
+        return set(self.unpublished)
+
+    def published(self):
+        """Mark the changes returned by `load()` so far as served; the next load reports only newer ones."""
+        self.unpublished.clear()
+
+    def sales_signature(self):
+        """Signatures of the fact table's sources as of the last load; equal signatures, equal table."""
+        return tuple(self.signatures.get(name) for name in SALES_SOURCES)
+
+    def columnar_path(self, name):
+        return os.path.join(self.data_dir, COLUMNAR_DIR, name)
+
+    def load_full(self, signatures):
+        with self.stage("load_products"):
+            self.products, _ = load_cached(
+                self.columnar_path("products"), {PRODUCTS_FILE: signatures[PRODUCTS_FILE]},
+                lambda: (pd.read_csv(self.path(PRODUCTS_FILE)), {}))
+        with self.stage("load_clients"):
+            self.clients, _ = load_cached(
+                self.columnar_path("clients"), {CLIENTS_FILE: signatures[CLIENTS_FILE]},
+                lambda: (pd.read_csv(self.path(CLIENTS_FILE)), {}))
+        with self.stage("load_sales"):
+            sources = {name: signatures[name] for name in SALES_SOURCES}
+            self.sales, metadata = load_cached(self.columnar_path("sales_fact"), sources, self.import_sales)
+            self.sales_columns = metadata["sales_columns"]
+            self.sales_offset = metadata["sales_offset"]
+            self.sales_tail = base64.b64decode(metadata["sales_tail"])
+        with self.stage("build_cube"):
+            self.cube = SalesCube.build(self.sales)
+        with self.stage("build_first_purchases"):
+            self.first_purchases = FirstPurchaseIndex.build(self.sales)
+        self.load_traffic(signatures)
+
+    def load_traffic(self, signatures):
+        with self.stage("load_traffic"):
+            traffic, _ = load_cached(
+                self.columnar_path("site_traffic"), {TRAFFIC_FILE: signatures[TRAFFIC_FILE]},
+                lambda: (read_traffic_csv(self.data_dir), {}))
+            self.traffic = add_traffic_keys(traffic)
+        with self.stage("build_traffic_series"):
+            self.traffic_series = TrafficSeries.build(self.traffic)
+
+    def import_sales(self):
+        """Parse sales.csv into the fact table, with the tail offset for later appends."""
+        with open(self.path(SALES_FILE), "rb") as f:
+            content = f.read()
+        raw_sales = pd.read_csv(io.BytesIO(content))
+        fact = build_sales_fact(raw_sales, self.products, self.clients)
+        metadata = {
+            "sales_columns": list(raw_sales.columns),
+            "sales_offset": len(content),
+            "sales_tail": base64.b64encode(content[-TAIL_FINGERPRINT_BYTES:]).decode(),
+        }
+        return fact, metadata
+
+    def mark_sales_offset(self, offset, tail):
+        self.sales_offset = offset
+        self.sales_tail = tail[-TAIL_FINGERPRINT_BYTES:]
+
+    def try_append(self, signature):
+        """Parse rows appended to sales.csv since the last load. False if the file was rewritten."""
+        if self.sales is None or signature is None:
+            return False
+        size = signature[1]
+        path = self.path(SALES_FILE)
+        if size < self.sales_offset or read_tail_fingerprint(path, self.sales_offset) != self.sales_tail:
+            return False
+        if not self.sales_tail.endswith(b"\n"):
+            return False  # Appended bytes would continue the last parsed row
+
+        with open(path, "rb") as f:
+            f.seek(self.sales_offset)
+            chunk = f.read(size - self.sales_offset)
+
+        # Only complete lines; a partially written last line is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            self.appended = self.sales.iloc[0:0]
+            return True
+
+        with self.stage("load_sales_tail"):
+            raw_sales = pd.read_csv(io.BytesIO(chunk[:end]), header=None, names=self.sales_columns)
+        with self.stage("build_fact"):
+            new_rows = build_sales_fact(raw_sales, self.products, self.clients)
+            self.sales = concat_fact(self.sales, new_rows)
+        with self.stage("build_cube"):
+            self.cube = self.cube.add(SalesCube.build(new_rows))
+        with self.stage("build_first_purchases"):
+            self.first_purchases = self.first_purchases.add(new_rows)
+        self.appended = new_rows
+        self.mark_sales_offset(self.sales_offset + end, self.sales_tail + chunk[:end])
+        return True
+
+
+if __name__ == "__main__":
+    # Ingest step: import the CSV sources into the columnar format ahead of a server start
+    store = DataStore()
+    store.load()
+    print(f"Ingested {len(store.sales)} sales rows into {os.path.join(store.data_dir, COLUMNAR_DIR)}")
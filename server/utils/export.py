@@ -0,0 +1,71 @@
+import csv
+import io
+import numpy as np
+from utils.payloads import dumps
+
+# Content type of each export format
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Rows read from the table and written out at a time
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def in_date_range(dates, start=None, end=None):
+    """Boolean per distinct 'YYYY-MM-DD' value (None last, never kept) for days in [start, end]."""
+    low = str(start) if start is not None else None
+    high = str(end) if end is not None else None
+    return np.array([value is not None and (low is None or value >= low) and (high is None or value <= high)
+                     for value in dates], dtype=bool)
+
+
+def row_blocks(records, date_field=None, start=None, end=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Rows to export, `chunk_rows` table rows at a time: slices, or positions when filtered by date.
+
+    Dates are compared once per distinct value, then looked up by code, so
+    neither the filter nor the blocks grow with the table.
+    """
+    keep = None
+    if date_field is not None and (start is not None or end is not None):
+        codes, dates = records.column(date_field)
+        keep = in_date_range(dates, start, end)
+
+    for first in range(0, len(records), chunk_rows):
+        block = slice(first, first + chunk_rows)
+        if keep is None:
+            yield block
+            continue
+        positions = np.flatnonzero(keep[codes[block]])
+        if len(positions):
+            yield positions + first
+
+
+## FORMATS ##
+def ndjson_chunks(records, blocks):
+    """One JSON object per line."""
+    for rows in blocks:
+        yield b"".join(dumps(row) + b"\n" for row in records.rows(rows))
+
+
+def csv_chunks(records, blocks):
+    """A header line with the field names, then one line per row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(records.fields)
+    for rows in blocks:
+        writer.writerows(zip(*records.values(rows)))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()  # Header only: nothing matched
+
+
+def export_chunks(records, export_format, **filters):
+    """Body of an export of `records` in `export_format`, produced block by block."""
+    blocks = row_blocks(records, **filters)
+    if export_format == "csv":
+        return csv_chunks(records, blocks)
+    return ndjson_chunks(records, blocks)
@@ -0,0 +1,55 @@
+import pandas as pd
+
+
+def month_key(year, month):
+    """Months since year 0, so (year, month) pairs compare and subtract as integers."""
+    return year * 12 + (month - 1)
+
+
+def _first_months(fact):
+    """Earliest purchase month key per client_id, in one vectorized groupby-min."""
+    keys = month_key(fact['year'].astype("int32"), fact['month'].astype("int32"))
+    return keys.groupby(fact['client_id'].to_numpy()).min()
+
+
+## FIRST PURCHASE INDEX ##
+class FirstPurchaseIndex:
+    """Month of each client's first purchase, plus a histogram of new clients per month.
+
+    The number of new clients in a month (clients whose first purchase ever
+    falls in it) is a dictionary lookup in the histogram.
+    """
+
+    def __init__(self, first_months):
+        self.first_months = first_months
+        self.histogram = first_months.value_counts().to_dict()
+
+    @classmethod
+    def build(cls, fact):
+        return cls(_first_months(fact))
+
+    def add(self, new_rows):
+        """A new index including the purchases in `new_rows`.
+
+        Only clients whose first purchase moved (new clients, or rows older than
+        anything seen for that client) touch the histogram.
+        """
+        new_first = _first_months(new_rows)
+        previous = self.first_months.reindex(new_first.index)
+        moved = previous.isna() | (new_first < previous)
+
+        index = FirstPurchaseIndex.__new__(FirstPurchaseIndex)
+        index.first_months = pd.concat([self.first_months.drop(new_first.index[moved], errors="ignore"),
+                                        new_first[moved]])
+        histogram = dict(self.histogram)
+        for key, count in previous[moved].dropna().astype("int64").value_counts().items():
+            histogram[key] -= count
+            if not histogram[key]:
+                del histogram[key]  # No client starts there any more, as if built from scratch
+        for key, count in new_first[moved].value_counts().items():
+            histogram[key] = histogram.get(key, 0) + count
+        index.histogram = histogram
+        return index
+
+    def new_clients(self, year, month):
+        return self.histogram.get(month_key(year, month), 0)
@@ -0,0 +1,117 @@
+from datetime import datetime
+import pandas as pd
+from utils.first_purchase import month_key
+
+# KPI columns of the period table
+KPI_COLUMNS = ["orders", "income", "new_clients", "inbound_traffic", "unique_visitors", "avg_session_duration"]
+
+
+def parse_period(period):
+    """Month key of a 'YYYY-MM' period. Raises ValueError for anything else."""
+    parsed = datetime.strptime(period, "%Y-%m")
+    return month_key(parsed.year, parsed.month)
+
+
+def format_period(key):
+    """'YYYY-MM' of a month key."""
+    return f"{key // 12:04d}-{key % 12 + 1:02d}"
+
+
+def percentage_diff(current, previous):
+    return round((current - previous) / previous, 2) if previous else None
+
+
+## KPI TABLE ##
+class KpiTable:
+    """Monthly KPIs indexed by month key, built in one grouped pass per source.
+
+    Orders and income come from the sales cube's (year, month) roll-up, new
+    clients from the first-purchase histogram and traffic from the monthly
+    buckets of the traffic series. Each month is stored as a dict of values, so the cards
+    for any period, with its month-over-month and year-over-year deltas, are a
+    few dictionary lookups.
+    """
+
+    def __init__(self, periods, annual_income):
+        self.periods = periods
+        self.annual_income = annual_income
+
+    @classmethod
+    def build(cls, cube, first_purchases, traffic_series):
+        sales = cube.rollup(by=('year', 'month'))[['orders', 'finalPrice']]
+        sales.index = month_key(sales.index.get_level_values('year').astype(int),
+                                sales.index.get_level_values('month').astype(int))
+        sales = sales.rename(columns={'finalPrice': 'income'})
+
+        site = traffic_series.buckets(granularity='month')
+        months = site['start'].to_numpy().astype('datetime64[M]').astype('int64')
+        site = site.set_index(months + month_key(1970, 1))[['inbound_traffic', 'unique_visitors', 'avg_session_duration']]
+
+        new_clients = pd.Series(first_purchases.histogram, dtype="int64", name='new_clients')
+
+        table = pd.concat([sales, new_clients, site], axis=1).sort_index()
+        table[['orders', 'income', 'new_clients', 'inbound_traffic', 'unique_visitors']] = \
+            table[['orders', 'income', 'new_clients', 'inbound_traffic', 'unique_visitors']].fillna(0)
+        annual_income = table['income'].groupby(table.index // 12).sum()
+        table = table[KPI_COLUMNS].astype(object).where(table[KPI_COLUMNS].notna(), None)
+        return cls({int(key): row for key, row in zip(table.index, table.to_dict(orient="records"))},
+                   {int(year): income for year, income in annual_income.items()})
+
+    def get(self, key):
+        return self.periods.get(key) or dict.fromkeys(KPI_COLUMNS, 0)
+
+    def latest_period(self):
+        """'YYYY-MM' of the latest month with sales; the current month when there are none."""
+        keys = [key for key, row in self.periods.items() if row['orders']]
+        if not keys:
+            return datetime.now().strftime("%Y-%m")
+        return format_period(max(keys))
+
+    def cards(self, period=None):
+        """Card values for `period` ('YYYY-MM', default: the latest month with sales), compared with
+        the previous month and the same month a year before. `annual_income` is the income of the period's year.
+        """
+        period = period or self.latest_period()
+        key = parse_period(period)
+        current, previous, last_year = self.get(key), self.get(key - 1), self.get(key - 12)
+
+        cards_data = {
+            'period': period,
+            'orders': int(current['orders']),
+            'income': round(current['income'], 2),
+            'new_clients': int(current['new_clients']),
+            'annual_income': round(self.annual_income.get(key // 12, 0), 2),
+            'inbound_traffic': round(current['inbound_traffic'], 2),
+            'unique_visitors': round(current['unique_visitors'], 2),
+            'avg_session_duration': (round(current['avg_session_duration'], 2)
+                                     if current['avg_session_duration'] is not None else None),
+        }
+
+        # Month-over-month differences
+        cards_data['percentage_diff_orders'] = percentage_diff(cards_data['orders'], previous['orders'])
+        cards_data['percentage_diff_income'] = percentage_diff(cards_data['income'], previous['income'])
+        cards_data['percentage_diff_new_clients'] = percentage_diff(cards_data['new_clients'], previous['new_clients'])
+        cards_data['percentage_diff_inbound_traffic'] = percentage_diff(cards_data['inbound_traffic'], previous['inbound_traffic'])
+        cards_data['percentage_diff_unique_visitors'] = percentage_diff(cards_data['unique_visitors'], previous['unique_visitors'])
+
+        # Year-over-year difference
+        cards_data['percentage_diff_income_year'] = percentage_diff(cards_data['income'], last_year['income'])
+
+        return cards_data
+
+
+# Key names of the first dashboard, for the period's values; only the default cards carry them
+LEGACY_CARD_KEYS = {
+    'november_orders': 'orders',
+    'november_income': 'income',
+    'november_new_clients': 'new_clients',
+    'annual_income_2024': 'annual_income',
+    'november_inbound_traffic': 'inbound_traffic',
+    'november_unique_visitors': 'unique_visitors',
+    'november_avg_session_duration': 'avg_session_duration',
+}
+
+
+def with_legacy_keys(cards_data):
+    """`cards_data` plus its values under the legacy key names."""
+    return {**cards_data, **{legacy: cards_data[key] for legacy, key in LEGACY_CARD_KEYS.items()}}
@@ -0,0 +1,102 @@
+from threading import Condition
+from utils.payloads import MIN_COMPRESS_SIZE, Payload, join_payloads
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+
+# Milliseconds a disconnected EventSource waits before reconnecting
+RECONNECT_DELAY = 3000
+
+
+def sse_event(event, data, event_id=None):
+    """One Server-Sent Events message; `data` is a single line of bytes."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode() + b"data: " + data + b"\n\n"
+
+
+def catch_up(last_version, version, notice, catchup):
+    """Message for a client that last saw `last_version` when `version` is current; None if it is up to date.
+
+    `notice` is the step to `version` from the version before it (None when
+    there was no single step), `catchup` reports every payload as changed.
+    """
+    if last_version is None or last_version == version:
+        return None
+    if notice is not None and last_version == version - 1:
+        return notice
+    return catchup
+
+
+## UPDATE FEED ##
+class UpdateFeed:
+    """Notices of published snapshots, for streaming clients to wait on.
+
+    Each notice lists the payloads that changed since the previous snapshot
+    (by ETag, as a refresh rebuilds payloads whose bodies come out the same) and
+    includes the bodies of the small ones, such as the cards, so clients only
+    refetch the large ones. Waiting clients are woken with a condition
+    variable; nothing runs per client while the data is unchanged.
+    """
+
+    def __init__(self, snapshot):
+        self.condition = Condition()
+        self.snapshot = snapshot
+        self.notice = None  # Notice for the step to `snapshot`, from the version before it
+        self.catchup = self.make_notice(snapshot, dict(snapshot.payloads))
+        self.closed = False
+
+    def publish(self, snapshot):
+        with self.condition:
+            # Subscribers run after the publish lock is released; drop one that arrives late
+            if snapshot.version <= self.snapshot.version:
+                return
+            changed = {name: payload for name, payload in snapshot.payloads.items()
+                       if getattr(self.snapshot.payloads.get(name), "etag", None) != payload.etag}
+            if snapshot.version == self.snapshot.version + 1:
+                self.notice = self.make_notice(snapshot, changed)
+            else:
+                self.notice = None
+            self.catchup = self.make_notice(snapshot, dict(snapshot.payloads))
+            self.snapshot = snapshot
+            self.condition.notify_all()
+
+    def state(self):
+        """(version, notice of the step to it, catch-up notice) of the current snapshot."""
+        with self.condition:
+            return self.snapshot.version, self.notice, self.catchup
+
+    @staticmethod
+    def make_notice(snapshot, changed):
+        small = {name: payload for name, payload in changed.items()
+                 if isinstance(payload, Payload) and len(payload.body) < MIN_COMPRESS_SIZE}
+        body = join_payloads("payloads", small, changed=sorted(changed), version=snapshot.version).body
+        return sse_event("update", body, event_id=snapshot.version)
+
+    def close(self):
+        """End every stream, e.g. when this process is about to exit."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def stream(self, last_version=None):
+        """Generator of SSE messages: a notice for each new snapshot, keep-alives in between.
+
+        A client reconnecting with the version it last saw first gets a notice
+        of what it missed: the last diff if it is one version behind, otherwise
+        every payload is reported as changed.
+        """
+        yield f"retry: {RECONNECT_DELAY}\n\n".encode()
+        version, notice, catchup = self.state()
+        message = catch_up(last_version, version, notice, catchup)
+        if message is not None:
+            yield message
+
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.closed or self.snapshot.version != version, HEARTBEAT_INTERVAL)
+                if self.closed:
+                    return
+                last_version, version = version, self.snapshot.version
+                notice, catchup = self.notice, self.catchup
+            # More than one step when several snapshots were published while this client was being written to
+            yield catch_up(last_version, version, notice, catchup) or b": keep-alive\n\n"
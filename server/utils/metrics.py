@@ -0,0 +1,167 @@
+import bisect
+import cProfile
+import io
+import math
+import pstats
+import time
+from threading import Lock
+from urllib.parse import parse_qsl, urlencode
+from flask import g, request
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+## PROMETHEUS TEXT FORMAT ##
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def format_value(value):
+    if value is None:
+        return "NaN"
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsText:
+    """Builder of a Prometheus text exposition: families of samples with HELP and TYPE lines."""
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name, kind, help_text, samples):
+        """Add a metric family; `samples` are (labels, value) pairs, or (suffix, labels, value) for histograms."""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for sample in samples:
+            suffix, labels, value = sample if len(sample) == 3 else ("", *sample)
+            self.lines.append(f"{name}{suffix}{format_labels(labels)} {format_value(value)}")
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+## HISTOGRAMS ##
+class Histogram:
+    """Cumulative-bucket histogram per label set."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.series = {}  # label values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self.series.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self, label_names):
+        for label_values, series in sorted(self.series.items()):
+            labels = dict(zip(label_names, label_values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                yield "_bucket", {**labels, "le": format_value(float(bound))}, cumulative
+            yield "_sum", labels, series[-1]
+            yield "_count", labels, cumulative
+
+
+## REQUEST METRICS ##
+class RequestMetrics:
+    """Per-route request counts, latency and response size histograms, recorded around each request."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.requests = {}  # (route, method, status) -> count
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+
+    def init_app(self, app):
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+
+    def before_request(self):
+        g.request_started = time.perf_counter()
+
+    def after_request(self, response):
+        started = g.pop("request_started", None)
+        if started is None:
+            return response
+        duration = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        size = response.content_length  # None for streamed responses
+        with self.lock:
+            key = (route, request.method, str(response.status_code))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.observe((route,), duration)
+            if size is not None:
+                self.size.observe((route,), size)
+        return response
+
+    def write(self, text):
+        with self.lock:
+            text.family("dashboard_http_requests_total", "counter", "HTTP requests by route, method and status.",
+                        [({"route": route, "method": method, "status": status}, count)
+                         for (route, method, status), count in sorted(self.requests.items())])
+            text.family("dashboard_http_request_duration_seconds", "histogram",
+                        "Time to build each response (streamed bodies excluded), by route.",
+                        list(self.latency.samples(("route",))))
+            text.family("dashboard_http_response_size_bytes", "histogram",
+                        "Response body size as sent (after compression), by route.",
+                        list(self.size.samples(("route",))))
+
+
+## PROFILING ##
+class RequestProfiler:
+    """WSGI middleware: answer a request with its cProfile report instead of its response.
+
+    Profiling is requested with a `__profile=1` query argument (removed before
+    the app sees the request) or an `X-Profile: 1` header. Only install this
+    where the reports may be shown.
+    """
+
+    def __init__(self, wsgi_app, limit=40):
+        self.wsgi_app = wsgi_app
+        self.limit = limit
+
+    def __call__(self, environ, start_response):
+        query = parse_qsl(environ.get("QUERY_STRING", ""), keep_blank_values=True)
+        if ("__profile", "1") not in query and environ.get("HTTP_X_PROFILE") != "1":
+            return self.wsgi_app(environ, start_response)
+        environ["QUERY_STRING"] = urlencode([(name, value) for name, value in query if name != "__profile"])
+
+        status = []
+        def capture(response_status, headers, exc_info=None):
+            status.append(response_status)
+            return lambda data: None
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            body = self.wsgi_app(environ, capture)
+            try:
+                size = sum(len(chunk) for chunk in body)
+            finally:
+                if hasattr(body, "close"):
+                    body.close()
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+
+        report = io.StringIO()
+        url = environ.get("PATH_INFO", "") + (f"?{environ['QUERY_STRING']}" if environ["QUERY_STRING"] else "")
+        report.write(f"{environ['REQUEST_METHOD']} {url} -> {status[0] if status else '?'}, "
+                     f"{size} bytes in {elapsed * 1000:.1f} ms\n\n")
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(self.limit)
+        text = report.getvalue().encode()
+        start_response("200 OK", [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", str(len(text)))])
+        return [text]
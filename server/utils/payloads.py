@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import json
+import zlib
+from flask import current_app, request
+
+# Optional fast encoder and compressor; the standard library is used without them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are always sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+# gzip level for bodies compressed while they stream out, on every request
+STREAM_COMPRESS_LEVEL = 1
+
+
+## SERIALIZATION ##
+def _default(obj):
+    """Fallback for values the standard json module can't encode."""
+    import numpy as np  # Already loaded by whatever built such values
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Encode `data` as compact JSON bytes with sorted keys, like Flask's jsonify."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_default, sort_keys=True, separators=(",", ":")).encode()
+
+
+## PAYLOADS ##
+class Payload:
+    """A response body encoded once: JSON bytes, compressed variants and an ETag."""
+
+    __slots__ = ("data", "body", "etag", "encoded")
+
+    def __init__(self, data, body, encoded):
+        self.data = data
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.encoded = encoded
+
+    @classmethod
+    def from_data(cls, data):
+        return cls.from_body(dumps(data), data)
+
+    @classmethod
+    def from_body(cls, body, data=None):
+        encoded = {}  # In order of preference
+        if len(body) >= MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                encoded["br"] = brotli.compress(body, quality=5)
+            encoded["gzip"] = gzip.compress(body, compresslevel=6)
+        return cls(data, body, encoded)
+
+
+class StreamedPayload:
+    """A response body too large to keep encoded: `chunks()` encodes it again, piece by piece, per request.
+
+    Only gzip is offered, compressed as the chunks stream out.
+    """
+
+    __slots__ = ("chunks", "etag")
+
+    def __init__(self, chunks, etag):
+        self.chunks = chunks
+        self.etag = etag
+
+
+def gzip_chunks(chunks, level=STREAM_COMPRESS_LEVEL):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 16 + 15: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def join_payloads(member, payloads, **fields):
+    """One Payload for a JSON object of `fields` plus `member`, an object of `{name: Payload}`.
+
+    The payload bodies are spliced in as they are, without decoding them again.
+    If any of them is a StreamedPayload, so is the result.
+    """
+    head = dumps(fields)[:-1] + (b"," if fields else b"") + dumps(member) + b":{"
+    members = [(dumps(name) + b":", payload) for name, payload in sorted(payloads.items())]
+    if not any(isinstance(payload, StreamedPayload) for _, payload in members):
+        return Payload.from_body(head + b",".join(key + payload.body for key, payload in members) + b"}}")
+
+    def chunks():
+        yield head
+        for i, (key, payload) in enumerate(members):
+            yield (b"," if i else b"") + key
+            if isinstance(payload, StreamedPayload):
+                yield from payload.chunks()
+            else:
+                yield payload.body
+        yield b"}}"
+
+    # Tagged by the members' own tags rather than by a body that is never held
+    tags = head + b"".join(key + payload.etag.encode() for key, payload in members)
+    return StreamedPayload(chunks, hashlib.blake2b(tags, digest_size=16).hexdigest())
+
+
+def payload_response(payload, status=200, version=None):
+    """Serve a Payload for the current request, honoring If-None-Match and Accept-Encoding."""
+    # Weak validator: the compressed variants are the same representation
+    headers = {
+        "ETag": f'W/"{payload.etag}"',
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if version is not None:
+        headers["X-Data-Version"] = str(version)
+    if request.if_none_match.contains_weak(payload.etag):
+        return current_app.response_class(status=304, headers=headers)
+
+    if isinstance(payload, StreamedPayload):
+        body = payload.chunks()
+        if request.accept_encodings.best_match(["gzip"]):
+            body = gzip_chunks(body)
+            headers["Content-Encoding"] = "gzip"
+        return current_app.response_class(body, status=status, mimetype="application/json", headers=headers)
+
+    body = payload.body
+    encoding = request.accept_encodings.best_match(list(payload.encoded))
+    if encoding:
+        body = payload.encoded[encoding]
+        headers["Content-Encoding"] = encoding
+
+    return current_app.response_class(body, status=status, mimetype="application/json", headers=headers)
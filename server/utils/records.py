@@ -0,0 +1,81 @@
+import sys
+import numpy as np
+import pandas as pd
+from utils.columnar import codes_dtype
+from utils.payloads import dumps
+
+# Rows turned into dicts and encoded at a time while a response streams out
+CHUNK_ROWS = 10_000
+
+
+def intern_values(values):
+    """Object array of the distinct values, strings interned, with a trailing None for code -1 (missing)."""
+    interned = [sys.intern(value) if isinstance(value, str) else value for value in values]
+    return np.array(interned + [None], dtype=object)
+
+
+def encode_column(column):
+    """A fact column as (codes, values), or (array, None) for numbers.
+
+    Categorical columns keep their codes (views of the table, not copies);
+    dates and other strings are factorized, dates rendered as 'YYYY-MM-DD'.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), intern_values(column.cat.categories)
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        codes, days = pd.factorize(column.to_numpy().astype("datetime64[D]"))
+        return codes.astype(codes_dtype(len(days)), copy=False), intern_values(np.datetime_as_string(days, unit="D").tolist())
+    if pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+        return column.to_numpy(), None
+    codes, uniques = pd.factorize(column)
+    return codes.astype(codes_dtype(len(uniques)), copy=False), intern_values(list(uniques))
+
+
+## COLUMNAR RECORDS ##
+class ColumnarRecords:
+    """The records of a table as the API sends them, held column by column.
+
+    Strings (such as the client and product dimensions and the sale dates)
+    are dictionary-encoded: a small integer code per row into an array of
+    the distinct values, each interned, so a name or an address exists once
+    however many sales repeat it. Row dicts are only built CHUNK_ROWS at a
+    time, while a response body is being encoded.
+    """
+
+    __slots__ = ("fields", "columns", "length")
+
+    def __init__(self, fields, columns, length):
+        self.fields = fields
+        self.columns = columns
+        self.length = length
+
+    @classmethod
+    def build(cls, table, exclude=()):
+        fields = [name for name in table.columns if name not in exclude]
+        return cls(fields, [encode_column(table[name]) for name in fields], len(table))
+
+    def __len__(self):
+        return self.length
+
+    def column(self, field):
+        """(codes, values) of a dictionary-encoded field, or (array, None) for a number."""
+        return self.columns[self.fields.index(field)]
+
+    def values(self, rows):
+        """Values of the selected rows (a slice or an array of positions), as one list per field."""
+        return [(codes[rows] if dictionary is None else dictionary[codes[rows]]).tolist()
+                for codes, dictionary in self.columns]
+
+    def rows(self, rows):
+        """The selected rows as dicts, like `to_dict(orient="records")`."""
+        return [dict(zip(self.fields, row)) for row in zip(*self.values(rows))]
+
+    def json_chunks(self, chunk_rows=CHUNK_ROWS):
+        """The JSON array of all records, encoded `chunk_rows` rows at a time."""
+        if not self.length:
+            yield b"[]"
+            return
+        for start in range(0, self.length, chunk_rows):
+            body = dumps(self.rows(slice(start, start + chunk_rows)))
+            yield (b"[" if start == 0 else b",") + body[1:-1]
+        yield b"]"
@@ -0,0 +1,42 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+## RESPONSE CACHE ##
+class ResponseCache:
+    """Bounded LRU cache of route payloads keyed by route and query arguments.
+
+    Entries belong to one data version; the first lookup made with a newer
+    version drops everything cached for the old one.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.version = None
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version, compute):
+        """Return the payload for `key`, calling `compute()` on a miss."""
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.version = version
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        # Compute outside the lock so slow builders don't serialize other routes
+        payload = compute()
+
+        with self.lock:
+            if version == self.version:
+                self.entries[key] = payload
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+        return payload
@@ -0,0 +1,154 @@
+import time
+import traceback
+from contextlib import contextmanager
+from threading import Event, Lock, Thread
+
+
+## REFRESH STATS ##
+class RefreshStats:
+    """Durations of each refresh run and of the named stages inside it."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_duration = None
+        self.last_error = None
+        self.stages = {}
+        self.current_stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block of work as stage `name` of the current run."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current_stages[name] = time.perf_counter() - start
+
+    @contextmanager
+    def run(self):
+        """Time one refresh run; stage timings recorded inside it are folded in at the end."""
+        self.current_stages = {}
+        self.last_started = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            with self.lock:
+                self.runs += 1
+                self.last_duration = time.perf_counter() - start
+                self.last_finished = time.time()
+                self.last_error = error
+                if error:
+                    self.failures += 1
+                for name, duration in self.current_stages.items():
+                    stage = self.stages.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+                    stage["count"] += 1
+                    stage["total"] += duration
+                    stage["max"] = max(stage["max"], duration)
+                    stage["last"] = duration
+
+    def record_skip(self):
+        with self.lock:
+            self.skipped += 1
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "runs": self.runs,
+                "skipped": self.skipped,
+                "failures": self.failures,
+                "last_started": self.last_started,
+                "last_finished": self.last_finished,
+                "last_duration": self.last_duration,
+                "last_error": self.last_error,
+                "stages": {
+                    name: {
+                        "count": stage["count"],
+                        "total": stage["total"],
+                        "last": stage["last"],
+                        "mean": stage["total"] / stage["count"],
+                        "max": stage["max"],
+                    }
+                    for name, stage in self.stages.items()
+                },
+            }
+
+
+## PARALLEL BUILDS ##
+def run_parallel(pool, jobs, stage):
+    """Run `{name: callable}` jobs on `pool`, timing each as a stage. Returns `{name: result}`.
+
+    Jobs share the caller's in-memory tables; the heavy work in them (numpy and
+    pandas kernels, zlib compression) releases the GIL, so they overlap on threads.
+    """
+    def timed(name, job):
+        with stage(name):
+            return job()
+
+    futures = {name: pool.submit(timed, name, job) for name, job in jobs.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+## REFRESH SCHEDULER ##
+class RefreshScheduler:
+    """Runs `job` every `interval` seconds on a single daemon worker thread.
+
+    Runs are scheduled from a fixed start time, so a slow run does not push
+    later ones back. A run that is still going when the next one is due, or
+    when `trigger()` is called, makes that run be skipped instead of overlapping.
+    """
+
+    def __init__(self, job, interval=60, stats=None):
+        self.job = job
+        self.interval = interval
+        self.stats = stats or RefreshStats()
+        self.running = Lock()
+        self.stopped = Event()
+        self.thread = None
+
+    def start(self, delay=None):
+        """Start the worker thread; its first run is due after `delay` seconds (default: one interval)."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = Thread(target=self.loop, args=(self.interval if delay is None else delay,),
+                             name="refresh-scheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def loop(self, delay):
+        next_run = time.monotonic() + delay
+        while not self.stopped.wait(max(0.0, next_run - time.monotonic())):
+            self.trigger()
+            # Skip any slots missed while the job ran, keeping the original cadence
+            slots = max(1, int(-(-(time.monotonic() - next_run) // self.interval)))
+            for _ in range(slots - 1):
+                self.stats.record_skip()
+            next_run += self.interval * slots
+
+    def trigger(self):
+        """Run the job now unless a run is already in progress. Returns True if it ran."""
+        if not self.running.acquire(blocking=False):
+            self.stats.record_skip()
+            return False
+        try:
+            with self.stats.run():
+                self.job()
+        except Exception:
+            print(f"Error: refresh failed\n{traceback.format_exc()}")
+        finally:
+            self.running.release()
+        return True
@@ -0,0 +1,73 @@
+import time
+from threading import Lock
+from types import MappingProxyType
+
+
+## SNAPSHOTS ##
+class Snapshot:
+    """Immutable view of everything the routes serve for one version of the data.
+
+    Holds the pre-serialized payloads, the sales cube the chart routes slice,
+    the KPI table behind the cards, the traffic series behind the bar chart
+    the table indexes behind paginated requests and the columnar records
+    behind streamed tables and exports. A new snapshot is built with
+    `evolve()` and never modified afterwards, so a request that reads one
+    snapshot sees a consistent set of payloads from start to finish.
+
+    `live` is False until a refresh has published data loaded from the
+    sources; before that, the only payloads are those restored from disk.
+    """
+
+    __slots__ = ("version", "payloads", "cube", "kpis", "traffic", "tables", "records", "live", "created")
+
+    def __init__(self, version=0, payloads=None, cube=None, kpis=None, traffic=None, tables=None, records=None,
+                 live=False):
+        self.version = version
+        self.payloads = MappingProxyType(dict(payloads or {}))
+        self.cube = cube
+        self.kpis = kpis
+        self.traffic = traffic
+        self.tables = MappingProxyType(dict(tables or {}))
+        self.records = MappingProxyType(dict(records or {}))
+        self.live = live
+        self.created = time.time()
+
+    def evolve(self, payloads=None, tables=None, records=None, **fields):
+        """Copy with the next version number, updated payloads/tables/records and replaced fields."""
+        return Snapshot(
+            version=self.version + 1,
+            payloads={**self.payloads, **(payloads or {})},
+            cube=fields.get("cube", self.cube),
+            kpis=fields.get("kpis", self.kpis),
+            traffic=fields.get("traffic", self.traffic),
+            tables={**self.tables, **(tables or {})},
+            records={**self.records, **(records or {})},
+            live=fields.get("live", self.live),
+        )
+
+
+class SnapshotRef:
+    """The currently published snapshot.
+
+    Readers take `current` without locking; publishing is a single reference
+    assignment. Writers are serialized so concurrent updates (a refresh and a
+    team write, say) each evolve the latest snapshot instead of overwriting
+    one another.
+    """
+
+    def __init__(self, snapshot=None):
+        self.current = snapshot or Snapshot()
+        self.lock = Lock()
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        """Call `callback(snapshot)` after each publish, outside the publish lock."""
+        self.subscribers.append(callback)
+
+    def publish(self, update):
+        """Publish `update(current)`, which must return a new Snapshot."""
+        with self.lock:
+            self.current = snapshot = update(self.current)
+        for callback in self.subscribers:
+            callback(snapshot)
+        return snapshot
@@ -0,0 +1,12 @@
+# Directory of the CSV sources (and of their columnar copies and the team database)
+DATA_DIR = "data"
+
+SALES_FILE = "sales.csv"
+PRODUCTS_FILE = "products.csv"
+CLIENTS_FILE = "clients.csv"
+TRAFFIC_FILE = "site_traffic.csv"
+
+SOURCE_FILES = (SALES_FILE, PRODUCTS_FILE, CLIENTS_FILE, TRAFFIC_FILE)
+
+# Sources joined into the sales fact table
+SALES_SOURCES = (SALES_FILE, PRODUCTS_FILE, CLIENTS_FILE)
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import struct
+import subprocess
+import sys
+from threading import Lock
+from urllib.parse import parse_qs, urlsplit
+from utils.live_updates import HEARTBEAT_INTERVAL, RECONNECT_DELAY, catch_up
+
+# Directory the stream process is started from, so `utils` is importable
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Header of each notice the master sends: the version, then the lengths of its
+# notice (0 when there is none) and of its catch-up notice
+FRAME = struct.Struct(">qII")
+
+# Bytes a client may leave unread before its stream is dropped (it reconnects and catches up)
+MAX_PENDING_BYTES = 1 << 20
+
+STREAM_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"X-Accel-Buffering: no\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"Connection: close\r\n\r\n"
+)
+
+NOT_FOUND = b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+def encode_frame(version, notice, catchup):
+    notice = notice or b""
+    return FRAME.pack(version, len(notice), len(catchup)) + notice + catchup
+
+
+## STREAM SERVER ##
+class StreamServer:
+    """Event streams of the update notices, served from one asyncio loop.
+
+    Runs in its own process, fed by the master over a pipe, so open streams
+    hold no web worker thread and outlive the workers' reloads. Each client
+    costs a socket and a few objects; an idle server wakes once per keep-alive.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.notice = None
+        self.catchup = None
+        self.clients = set()
+
+    def send(self, writer, message):
+        if writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            writer.close()
+            self.clients.discard(writer)
+        else:
+            writer.write(message)
+
+    def broadcast(self, message):
+        for writer in list(self.clients):
+            self.send(writer, message)
+
+    def post(self, version, notice, catchup):
+        # Every client is at the current version: one message brings them all to the next
+        if self.version is not None and version <= self.version:
+            return
+        message = catch_up(self.version, version, notice, catchup) if self.version is not None else None
+        self.version, self.notice, self.catchup = version, notice, catchup
+        if message is not None:
+            self.broadcast(message)
+
+    async def read_notices(self, reader):
+        """Apply the master's notices until it closes the pipe."""
+        while True:
+            try:
+                version, notice_size, catchup_size = FRAME.unpack(await reader.readexactly(FRAME.size))
+                notice = await reader.readexactly(notice_size) if notice_size else None
+                catchup = await reader.readexactly(catchup_size)
+            except asyncio.IncompleteReadError:
+                return
+            self.post(version, notice, catchup)
+
+    async def heartbeat(self):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            self.broadcast(b": keep-alive\n\n")
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            url = urlsplit(target)
+            if method != "GET" or url.path != "/api/stream" or self.version is None:
+                writer.write(NOT_FOUND)
+                return
+
+            # EventSource sends the id of the last notice it got when it reconnects
+            last_version = headers.get("last-event-id") or parse_qs(url.query).get("version", [None])[0]
+            last_version = int(last_version) if last_version is not None and last_version.isdigit() else None
+
+            writer.write(STREAM_HEADERS + f"retry: {RECONNECT_DELAY}\n\n".encode())
+            message = catch_up(last_version, self.version, self.notice, self.catchup)
+            if message is not None:
+                writer.write(message)
+            self.clients.add(writer)
+            while await reader.read(4096):
+                pass  # Nothing more is expected; wait for the client to disconnect
+        except (ValueError, ConnectionError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def serve(self, host, port, notices):
+        server = await asyncio.start_server(self.handle, host, port)
+        heartbeat = asyncio.create_task(self.heartbeat())
+        await self.read_notices(notices)
+        heartbeat.cancel()
+        server.close()
+        for writer in list(self.clients):
+            writer.close()
+
+
+async def main(bind):
+    host, _, port = bind.rpartition(":")
+    loop = asyncio.get_running_loop()
+    notices = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(notices), sys.stdin.buffer)
+    await StreamServer().serve(host or None, int(port), notices)
+
+
+## MASTER SIDE ##
+class StreamProcess:
+    """The stream server's process, started and fed with notices by the process that refreshes."""
+
+    def __init__(self, bind):
+        self.bind = bind
+        self.process = None
+        self.lock = Lock()
+
+    def start(self):
+        self.process = subprocess.Popen([sys.executable, "-m", "utils.stream_server", self.bind],
+                                        stdin=subprocess.PIPE, cwd=SERVER_DIR)
+
+    def post(self, version, notice, catchup):
+        with self.lock:
+            try:
+                self.process.stdin.write(encode_frame(version, notice, catchup))
+                self.process.stdin.flush()
+            except (OSError, ValueError) as e:
+                print(f"Error: could not send an update notice to the stream server: {e}")
+
+    def stop(self):
+        """Close the pipe; the stream server ends its streams and exits."""
+        with self.lock:
+            self.process.stdin.close()
+        self.process.wait(timeout=5)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1]))
@@ -0,0 +1,170 @@
+import base64
+import json
+import numpy as np
+import pandas as pd
+from threading import Lock
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Query arguments that are not column filters
+RESERVED_ARGS = {"offset", "limit", "sort", "cursor"}
+
+# Filter operators, written as `column__op=value`
+FILTER_OPERATORS = ("gte", "lte", "contains")
+
+
+## CURSORS ##
+def encode_cursor(value, row):
+    """Opaque keyset cursor: the sort value and table position of the last row served."""
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    if isinstance(value, pd.Timestamp):
+        value = value.isoformat()
+    elif isinstance(value, np.generic):
+        value = value.item()
+    return base64.urlsafe_b64encode(json.dumps([value, int(row)]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, row = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    return value, int(row)
+
+
+def _coerce(series, value):
+    """Convert a query-string value to the dtype of `series`."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return pd.Timestamp(value)
+    if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return pd.to_numeric(value)
+    return value
+
+
+def _sort_keys(series):
+    """Numpy array the column is ordered by; text-like columns compare as strings."""
+    if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.to_numpy()
+    return series.astype(object).fillna("").astype(str).to_numpy()
+
+
+## TABLE INDEX ##
+class TableIndex:
+    """Sorted indexes over an in-memory table, built lazily per sort column.
+
+    Each index is a stable argsort of the column, so rows with equal values
+    stay in table order; that order is the tie-breaker for keyset cursors.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.orders = {}
+        self.lock = Lock()
+
+    def order(self, column):
+        """(row positions in sorted order, sort keys in table order) for `column`."""
+        with self.lock:
+            if column not in self.orders:
+                keys = _sort_keys(self.table[column])
+                self.orders[column] = (np.argsort(keys, kind="stable"), keys)
+            return self.orders[column]
+
+    def mask(self, filters):
+        """Boolean row mask for `{argument: value}` filters, or None when unfiltered."""
+        mask = None
+        for argument, value in filters.items():
+            column, _, operator = argument.partition("__")
+            if column not in self.table.columns or (operator and operator not in FILTER_OPERATORS):
+                raise ValueError(f"Unknown filter '{argument}'")
+
+            series = self.table[column]
+            if operator == "contains":
+                condition = series.astype(str).str.contains(value, case=False, regex=False, na=False)
+            elif operator in ("gte", "lte"):
+                # Compared like the column sorts: text columns (categoricals included) as strings
+                keys = self.order(column)[1]
+                bound = value if keys.dtype == object else _coerce(series, value)
+                condition = keys >= bound if operator == "gte" else keys <= bound
+                if keys.dtype == object:
+                    condition &= series.notna().to_numpy()  # Missing text sorts as "", but matches no range, like NaN
+            else:
+                condition = series == _coerce(series, value)
+
+            condition = np.asarray(condition)
+            mask = condition if mask is None else mask & condition
+        return mask
+
+    def query(self, args):
+        """Select one page of rows from `args` (offset/limit/sort/cursor and column filters).
+
+        Returns the page as a DataFrame and a dict with the total number of
+        matching rows, the offset and limit applied and the cursor of the next page.
+        """
+        try:
+            limit = min(int(args.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+            offset = int(args.get("offset", 0))
+        except ValueError:
+            raise ValueError("offset and limit must be integers")
+        if limit < 0 or offset < 0:
+            raise ValueError("offset and limit must be non-negative")
+
+        sort = args.get("sort")
+        descending = False
+        if sort:
+            descending = sort.startswith("-")
+            sort = sort.lstrip("-")
+            if sort not in self.table.columns:
+                raise ValueError(f"Unknown sort column '{sort}'")
+            positions = self.order(sort)[0]
+            if descending:
+                positions = positions[::-1]
+        else:
+            positions = np.arange(len(self.table))
+
+        mask = self.mask({key: value for key, value in args.items() if key not in RESERVED_ARGS})
+        if mask is not None:
+            positions = positions[mask[positions]]
+        total = len(positions)
+
+        cursor = args.get("cursor")
+        if cursor:
+            positions = positions[self._after_cursor(positions, sort, descending, *decode_cursor(cursor)):]
+            offset = 0
+
+        page_positions = positions[offset:offset + limit]
+        page = self.table.iloc[page_positions]
+
+        next_cursor = None
+        if len(page_positions) and offset + limit < len(positions):
+            last = page_positions[-1]
+            next_cursor = encode_cursor(self.order(sort)[1][last] if sort else last, last)
+
+        return page, {"total": int(total), "offset": offset, "limit": limit, "next_cursor": next_cursor}
+
+    def _after_cursor(self, positions, sort, descending, value, row):
+        """Index into `positions` of the first row after the cursor."""
+        if not sort:
+            return int(np.searchsorted(positions, row, side="right"))
+
+        keys = self.order(sort)[1]
+        values = keys[positions]
+        if keys.dtype == object:
+            value = str(value)
+        else:
+            value = np.asarray(_coerce(self.table[sort], value)).astype(keys.dtype)
+
+        if descending:
+            # Values run high to low; ties run from the last table row to the first
+            start = len(values) - int(np.searchsorted(values[::-1], value, side="right"))
+            end = len(values) - int(np.searchsorted(values[::-1], value, side="left"))
+            ties = positions[start:end][::-1]
+            return end - int(np.searchsorted(ties, row, side="left"))
+
+        start = int(np.searchsorted(values, value, side="left"))
+        end = int(np.searchsorted(values, value, side="right"))
+        return start + int(np.searchsorted(positions[start:end], row, side="right"))
+
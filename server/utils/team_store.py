@@ -0,0 +1,91 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from utils.sources import DATA_DIR
+
+TEAM_DB = "team.db"
+TEAM_CSV = "team.csv"
+
+# Columns in the order the frontend and team.csv use
+TEAM_COLUMNS = ["id", "name", "phone", "email", "role", "access"]
+
+
+## TEAM STORE ##
+class TeamStore:
+    """Team members in an embedded SQLite database.
+
+    Ids come from an AUTOINCREMENT primary key, so they are allocated
+    atomically and never reused after a delete. Each operation opens its own
+    connection, which keeps the store safe to use from any request thread;
+    WAL mode lets reads run while a write is in progress. team.csv is only
+    read to seed a new database.
+
+    Triggers bump a revision counter on every change, so processes sharing
+    the database can tell cheaply whether their copy of the team is stale.
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.db_path = os.path.join(data_dir, TEAM_DB)
+        self.csv_path = os.path.join(data_dir, TEAM_CSV)
+        self.create()
+
+    @contextmanager
+    def connect(self):
+        """Connection committed on success, rolled back on error, and always closed."""
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def create(self):
+        with self.connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS team ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "name TEXT NOT NULL, phone TEXT, email TEXT, role TEXT, access TEXT)"
+            )
+            connection.execute("CREATE TABLE IF NOT EXISTS team_revision (revision INTEGER NOT NULL)")
+            connection.execute("INSERT INTO team_revision SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM team_revision)")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                connection.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS team_{event.lower()}_revision AFTER {event} ON team "
+                    "BEGIN UPDATE team_revision SET revision = revision + 1; END"
+                )
+            # Seed from team.csv the first time the database is created
+            seeded = connection.execute("SELECT 1 FROM sqlite_sequence WHERE name = 'team'").fetchone()
+            if not seeded and os.path.exists(self.csv_path):
+                import pandas as pd  # Only needed to seed a new database
+                members = pd.read_csv(self.csv_path, dtype=str, keep_default_na=False)[TEAM_COLUMNS]
+                connection.executemany(
+                    "INSERT INTO team (id, name, phone, email, role, access) VALUES (?, ?, ?, ?, ?, ?)",
+                    ((int(member_id), *rest) for member_id, *rest in members.itertuples(index=False, name=None)),
+                )
+
+    def revision(self):
+        """Counter incremented by every change to the team table."""
+        with self.connect() as connection:
+            return connection.execute("SELECT revision FROM team_revision").fetchone()[0]
+
+    def all(self):
+        with self.connect() as connection:
+            rows = connection.execute(f"SELECT {', '.join(TEAM_COLUMNS)} FROM team ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def add(self, member):
+        """Insert a member (a dict without id) and return its new id."""
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO team (name, phone, email, role, access) VALUES (?, ?, ?, ?, ?)",
+                (member["name"], member["phone"], member["email"], member["role"], member["access"]),
+            )
+            return cursor.lastrowid
+
+    def delete(self, member_id):
+        """Delete a member by id. Returns False when no such member exists."""
+        with self.connect() as connection:
+            cursor = connection.execute("DELETE FROM team WHERE id = ?", (member_id,))
+            return cursor.rowcount > 0
@@ -0,0 +1,118 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+GRANULARITIES = ("day", "week", "month", "year")
+
+# Name of the bucket label field for each granularity; months keep the bar chart's key
+LABEL_FIELDS = {"day": "date", "week": "week", "month": "year_month", "year": "year"}
+
+MEASURES = ("inbound_traffic", "unique_visitors", "avg_session_duration")
+
+# Most buckets a single query may ask for
+MAX_BUCKETS = 10_000
+
+
+def parse_day(value):
+    """A 'YYYY-MM-DD' string as a day. Raises ValueError for anything else, partial dates included."""
+    try:
+        day = datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        day = None
+    if day is None or len(value) != 10:  # strptime also takes unpadded months and days
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    return np.datetime64(day, "D")
+
+
+def parse_day_range(args):
+    """The days of the 'from' and 'to' query arguments, both included; None for one that is absent."""
+    start, end = args.get('from'), args.get('to')
+    return (parse_day(start) if start else None), (parse_day(end) if end else None)
+
+
+def bucket_starts(start, end, granularity):
+    """First day of each calendar bucket overlapping [start, end], and the day after the last bucket."""
+    if granularity == "day":
+        starts = np.arange(start, end + 1)
+        return starts, end + 1
+    if granularity == "week":
+        # ISO weeks start on Monday; day 0 (1970-01-01) was a Thursday
+        first = start - (start.astype("int64") + 3) % 7
+        starts = np.arange(first, end + 1, 7)
+        return starts, starts[-1] + 7
+    unit = "M" if granularity == "month" else "Y"
+    periods = np.arange(start.astype(f"datetime64[{unit}]"), end.astype(f"datetime64[{unit}]") + 1)
+    return periods.astype("datetime64[D]"), (periods[-1] + 1).astype("datetime64[D]")
+
+
+def bucket_labels(starts, granularity):
+    if granularity == "week":
+        iso = pd.DatetimeIndex(starts).isocalendar()
+        return (iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)).tolist()
+    unit = {"day": "D", "month": "M", "year": "Y"}[granularity]
+    return np.datetime_as_string(starts.astype(f"datetime64[{unit}]")).tolist()
+
+
+## TRAFFIC SERIES ##
+class TrafficSeries:
+    """Daily site traffic as a sorted day index with running sums of each measure.
+
+    `sums[name][i]` is the total of the first i days (and `sums["days"]` counts
+    the rows summed), so the totals of any date range are two binary searches
+    on the day index and a subtraction, and the average session duration of a
+    range is its running-sum difference over its row count.
+    """
+
+    def __init__(self, days, sums):
+        self.days = days
+        self.sums = sums
+
+    @classmethod
+    def build(cls, traffic):
+        days = traffic['date'].to_numpy().astype("datetime64[D]")
+        order = np.argsort(days, kind="stable")
+        unique_days, first_rows = np.unique(days[order], return_index=True)
+
+        # Per-day totals first, in case a day has several rows
+        sums = {}
+        for name in MEASURES:
+            per_day = np.add.reduceat(traffic[name].to_numpy()[order], first_rows) if len(days) else np.zeros(0)
+            sums[name] = np.concatenate(([0], np.cumsum(per_day)))
+        sums["days"] = np.concatenate(([0], np.cumsum(np.diff(np.append(first_rows, len(days))))))
+        return cls(unique_days, sums)
+
+    def bounds(self):
+        """First and last day with traffic, or None when there is none."""
+        return (self.days[0], self.days[-1]) if len(self.days) else None
+
+    def buckets(self, start=None, end=None, granularity="month"):
+        """Totals per calendar bucket of the days in [start, end] (both included, default: all).
+
+        Returns a DataFrame with the bucket labels, start days, row counts and
+        each measure (avg_session_duration averaged over the bucket's rows).
+        Buckets without traffic are left out.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Invalid granularity '{granularity}', expected one of {', '.join(GRANULARITIES)}")
+        bounds = self.bounds()
+        if bounds is None:
+            return pd.DataFrame(columns=["label", "start", "days", *MEASURES])
+        start = bounds[0] if start is None else max(start, bounds[0])
+        end = bounds[1] if end is None else min(end, bounds[1])
+        if start > end:
+            return pd.DataFrame(columns=["label", "start", "days", *MEASURES])
+
+        starts, stop = bucket_starts(start, end, granularity)
+        if len(starts) > MAX_BUCKETS:
+            raise ValueError(f"Too many {granularity} buckets ({len(starts)}), the limit is {MAX_BUCKETS}")
+
+        # Bucket edges, clipped to the range, located in the day index all at once
+        edges = np.append(starts, stop)
+        edges[0], edges[-1] = start, end + 1
+        positions = np.searchsorted(self.days, edges, side="left")
+
+        totals = {name: np.diff(cumulative[positions]) for name, cumulative in self.sums.items()}
+        buckets = pd.DataFrame({"label": bucket_labels(starts, granularity), "start": starts, **totals})
+        buckets = buckets[buckets["days"] > 0].reset_index(drop=True)
+        buckets["avg_session_duration"] = buckets["avg_session_duration"] / buckets["days"]
+        return buckets
@@ -0,0 +1,65 @@
+import json
+import os
+from utils.payloads import Payload
+
+SNAPSHOT_DIR = "snapshot"
+MANIFEST_FILE = "manifest.json"
+
+# File suffix of each body variant
+SUFFIXES = {"identity": ".json", "gzip": ".json.gz", "br": ".json.br"}
+
+
+## SAVED PAYLOADS ##
+def write_file(path, content):
+    """Write `content` next to `path` and rename it into place, so readers never see a partial file."""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def save_snapshot(path, payloads):
+    """Save the encoded bodies of `{name: Payload}` for a later start to serve before its first refresh.
+
+    Bodies are stored under their ETags, so unchanged payloads are not written
+    again; the manifest is replaced last and every file it does not name
+    (older bodies, leftovers of an interrupted save) is removed. Streamed payloads have no body to save and are skipped.
+    """
+    os.makedirs(path, exist_ok=True)
+    manifest = {}
+    for name, payload in sorted(payloads.items()):
+        if not isinstance(payload, Payload):
+            continue
+        variants = {"identity": payload.body, **payload.encoded}
+        for encoding, content in variants.items():
+            file_path = os.path.join(path, payload.etag + SUFFIXES[encoding])
+            if not os.path.exists(file_path):
+                write_file(file_path, content)
+        manifest[name] = {"etag": payload.etag, "encodings": list(payload.encoded)}
+    write_file(os.path.join(path, MANIFEST_FILE), json.dumps(manifest).encode())
+
+    kept = {payload["etag"] + SUFFIXES[encoding]
+            for payload in manifest.values() for encoding in ("identity", *payload["encodings"])}
+    for file_name in os.listdir(path):
+        if file_name != MANIFEST_FILE and file_name not in kept:
+            os.remove(os.path.join(path, file_name))
+
+
+def load_snapshot(path):
+    """The payloads saved at `path` as `{name: Payload}`; empty when there are none (or they are incomplete)."""
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        payloads = {}
+        for name, saved in manifest.items():
+            stem = os.path.join(path, saved["etag"])
+            encoded = {encoding: read_file(stem + SUFFIXES[encoding]) for encoding in saved["encodings"]}
+            payloads[name] = Payload(None, read_file(stem + SUFFIXES["identity"]), encoded)
+    except (OSError, ValueError, KeyError):
+        return {}  # Start cold: the first refresh builds everything
+    return payloads